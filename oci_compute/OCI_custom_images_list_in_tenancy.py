@@ -11,23 +11,32 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-09-08: Initial Version
+#    2026-10-19: Add --catalog option (all custom images in all regions in parallel, with size and OS, sorted by age or size)
+#    2026-10-19: --sort is rejected without --catalog (it was ignored)
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
 import sys
+import datetime
+import concurrent.futures
 
 # ---------- Functions
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of parallel GET requests per region in catalog mode
 
 # ---- usage syntax
 def usage():
     print ("Usage: {} OCI_PROFILE".format(sys.argv[0]))
+    print ("    or {} --catalog [--sort age|size] OCI_PROFILE".format(sys.argv[0]))
     print ("")
-    print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- Without --catalog, only available custom images tagged with {}.{} are listed".format(tag_ns, tag_key))
+    print ("- With --catalog, all custom images are listed (all regions searched in parallel) with their size,")
+    print ("  operating system and age, sorted by age (oldest first, default) or by size (largest first)")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -39,18 +48,76 @@ def usage():
 
 # -- Get the name of of compartment from its id
 def get_cpt_name_from_id(cpt_id):
-    for c in compartments:
-        if (c.id == cpt_id):
-            return c.name
+    if cpt_id in compartments:
+        return compartments[cpt_id].name
     return "root"
 
+# -- Catalog mode: get details (size, OS...) of custom images of a region using parallel GET requests
+def get_images_details(ComputeClient, image_ids):
+    def get_image(image_id):
+        try:
+            return ComputeClient.get_image(image_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
+        except oci.exceptions.ServiceError:
+            return None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        return [ image for image in executor.map(get_image, image_ids) if image != None ]
+
+# -- Catalog mode: get all custom images in a region (all pages of results) with their details
+def get_custom_images(region):
+    region_config = dict(config, region=region)
+    SearchClient  = oci.resource_search.ResourceSearchClient(region_config)
+    ComputeClient = oci.core.ComputeClient(region_config)
+    query = "query image resources"
+    response = oci.pagination.list_call_get_all_results(SearchClient.search_resources, oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    return get_images_details(ComputeClient, [ item.identifier for item in response.data ])
+
+# -- Catalog mode: list custom images of all regions sorted by age or size
+def display_catalog():
+    images = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(regions)) as executor:
+        futures = { executor.submit(get_custom_images, region.region_name): region.region_name for region in regions }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                images.extend([ (futures[future], image) for image in future.result() ])
+            except oci.exceptions.ServiceError as error:
+                print ("WARNING: cannot list custom images in region {}: {}".format(futures[future], error.message), file=sys.stderr)
+
+    if sort_by == "size":
+        images.sort(key=lambda item: item[1].size_in_mbs or 0, reverse=True)
+    else:
+        images.sort(key=lambda item: item[1].time_created)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    total_size = 0
+    print ("Region, Compartment, Custom image name, Operating system, Size (GB), Time created, Age (days), State, OCID")
+    for region, image in images:
+        total_size += image.size_in_mbs or 0
+        print ("{:s}, {:s}, {:s}, {:s} {:s}, {:.1f}, {:s}, {:d}, {:s}, {:s}".format(region, get_cpt_name_from_id(image.compartment_id), image.display_name, image.operating_system or "-", image.operating_system_version or "-", (image.size_in_mbs or 0) / 1024, image.time_created.strftime("%Y-%m-%d"), (now - image.time_created).days, image.lifecycle_state, image.id))
+    print ("")
+    print ("{} custom images in {} regions, total size {:.1f} GB".format(len(images), len(regions), total_size / 1024))
+
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) == 2:
-    profile  = sys.argv[1]
+tag_ns  = "osc"
+tag_key = "created-by"
+catalog = False
+sort_by = None
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("--"):
+    if   args[0] == "--catalog": catalog = True
+    elif args[0] == "--sort" and len(args) > 1 and args[1] in ("age", "size"):
+        sort_by = args[1]
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if len(args) == 1 and (catalog or sort_by == None):
+    profile  = args[0]
 else:
     usage()
+if sort_by == None:
+    sort_by = "age"
 
 # -- load profile from config file
 try:
@@ -65,19 +132,22 @@ RootCompartmentID = user.compartment_id
 
 # -- Get list of compartments with all sub-compartments
 response = oci.pagination.list_call_get_all_results(IdentityClient.list_compartments,RootCompartmentID,compartment_id_in_subtree=True)
-compartments = response.data
+compartments = { c.id: c for c in response.data }
 
 # -- get list of subscribed regions
 response = oci.pagination.list_call_get_all_results(IdentityClient.list_region_subscriptions, RootCompartmentID)
 regions = response.data
 
+# -- catalog mode
+if catalog:
+    display_catalog()
+    exit (0)
+
 # -- headers
 print ("Region, Compartment, Custom image name, OCID, Time created, Created by")
 
 # -- Get the list of custom images using OSC specific tags and a query
 # -- see https://docs.cloud.oracle.com/en-us/iaas/Content/Search/Concepts/querysyntax.htm
-tag_ns  = "osc"
-tag_key = "created-by"
 query   = "query all resources where (definedTags.namespace = '{:s}' && definedTags.key = '{:s}' )".format(tag_ns, tag_key)
 
 for region in regions:
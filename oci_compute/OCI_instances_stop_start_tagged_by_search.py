@@ -25,6 +25,8 @@
 #    2020-09-17: bug fix (root compartment was ignored)
 #    2020-09-18: Add a retry strategy for ComputeClient.instance_action to avoid errors "TooManyRequest HTTP 429"
 #    2021-01-08: Use a search query to accelerate the script
+#    2026-10-19: Reuse SDK clients (one client per service and region) instead of creating one client per call
+#    2026-10-19: Client pool shared in oci_misc/oci_scripts_common.py, only used for the clients created in loops
 # ---------------------------------------------------------------------------------------------------------------------------------
 
 # -- import
@@ -32,6 +34,8 @@ import oci
 import sys
 import os
 from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import get_client
 
 # ---------- Tag names, key and value to look for
 # Instances tagged using this will be stopped/started.
@@ -89,7 +93,7 @@ def process_instance (inst_id, lcpt_name):
     #print (f"DEBUG: {region} {lcpt_name} {inst_id}")
 
     # get details about compute instance from regular API 
-    ComputeClient = oci.core.ComputeClient(config)
+    ComputeClient = get_client(oci.core.ComputeClient, config)
     try:
         response = ComputeClient.get_instance (inst_id)
         instance = response.data
@@ -11,22 +11,40 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-06-12: Initial Version
+#    2026-10-19: Add local cache of images per region (with TTL) indexed by OS, version and compatible shapes
+#    2026-10-19: Cache file per profile and region (images visible in a region depend on the tenancy)
+#    2026-10-19: Images without operating system or version are indexed with an empty name
+#                and --os, --version, --shape, --latest options to query it
 # ---------------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
+import os
 import sys
+import json
+import time
+import concurrent.futures
+from pathlib import Path
 
 # ---------- Functions
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+cache_ttl  = 24                 # Nb of hours before the local cache of images is refreshed
+nb_threads = 10                 # Nb of parallel requests to get compatible shapes of images when refreshing the cache
+CACHE_FILE = str(Path.home())+"/.oci/provided_images_{}_{}.json"    # profile and region
 
 # ---- usage syntax
 def usage():
-    print ("Usage: {} OCI_PROFILE".format(sys.argv[0]))
+    print ("Usage: {} [--ttl hours] [--os operating_system] [--version os_version] [--shape shape] [--latest] OCI_PROFILE".format(sys.argv[0]))
     print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- The list of images is saved in a local cache file per profile and region ({})".format(CACHE_FILE.format("<profile>", "<region>")))
+    print ("  which is used if it is less than {} hours old (change it with --ttl, --ttl 0 to refresh the cache)".format(cache_ttl))
+    print ("- --os, --version and --shape only list images for this operating system, OS version and compatible shape")
+    print ("  (newest first) and --latest only displays the most recent one, for example:")
+    print ("  {} --os \"Oracle Linux\" --version 8 --shape VM.Standard.A1.Flex --latest EMEAOSCf".format(sys.argv[0]))
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -36,19 +54,103 @@ def usage():
     print ("region      = eu-frankfurt-1")
     exit (1)
 
-def list_compute_images():
+# ---- get the list of shapes compatible with an image
+def get_compatible_shapes(ComputeClient, image_id):
+    try:
+        response = oci.pagination.list_call_get_all_results(ComputeClient.list_image_shape_compatibility_entries, image_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        return [ entry.shape for entry in response.data ]
+    except oci.exceptions.ServiceError:
+        return []
+
+# ---- get the list of images from OCI and save it in the local cache file with indexes
+# ---- indexes: image ids per operating system, per operating system and version and per compatible shape (newest first)
+def refresh_cache(cache_file):
     ComputeClient = oci.core.ComputeClient(config)
-    response = oci.pagination.list_call_get_all_results(ComputeClient.list_images,compartment_id=RootCompartmentID)
-    if len(response.data) > 0:
-        for image in response.data:
-            print ('{0:100s} {1:s}'.format(image.id, image.display_name))
+    response = oci.pagination.list_call_get_all_results(ComputeClient.list_images, compartment_id=config["tenancy"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    images = sorted(response.data, key=lambda image: image.time_created, reverse=True)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        shapes = list(executor.map(lambda image: get_compatible_shapes(ComputeClient, image.id), images))
+
+    cache = { "region":        config["region"],
+              "timestamp":     time.time(),
+              "images":        {},
+              "by_os":         {},
+              "by_os_version": {},
+              "by_shape":      {} }
+    for image, image_shapes in zip(images, shapes):
+        cache["images"][image.id] = { "display_name":             image.display_name,
+                                      "operating_system":         image.operating_system,
+                                      "operating_system_version": image.operating_system_version,
+                                      "time_created":             image.time_created.isoformat() }
+        cache["by_os"].setdefault((image.operating_system or "").lower(), []).append(image.id)
+        cache["by_os_version"].setdefault("{} {}".format(image.operating_system or "", image.operating_system_version or "").lower(), []).append(image.id)
+        for shape in image_shapes:
+            cache["by_shape"].setdefault(shape.lower(), []).append(image.id)
+
+    try:
+        with open(cache_file+".tmp", "w") as f:
+            json.dump(cache, f)
+        os.replace(cache_file+".tmp", cache_file)
+    except OSError:
+        print ("WARNING: cannot save cache file {} !".format(cache_file), file=sys.stderr)
+    return cache
+
+# ---- get the list of images from the local cache file if less than cache_ttl hours old, otherwise from OCI
+def load_cache():
+    cache_file = CACHE_FILE.format(profile, config["region"])
+    try:
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+        if time.time() - cache["timestamp"] < cache_ttl * 3600:
+            return cache
+    except (OSError, ValueError, KeyError):
+        pass
+    return refresh_cache(cache_file)
+
+# ---- get the ids of images matching the filters (newest first) using the indexes
+def find_images(cache):
+    if   os_name != None and os_version != None: image_ids = cache["by_os_version"].get("{} {}".format(os_name, os_version).lower(), [])
+    elif os_name != None:                        image_ids = cache["by_os"].get(os_name.lower(), [])
+    else:                                        image_ids = list(cache["images"].keys())
+    if os_name == None and os_version != None:
+        image_ids = [ image_id for image_id in image_ids if cache["images"][image_id]["operating_system_version"] == os_version ]
+    if shape != None:
+        shape_image_ids = set(cache["by_shape"].get(shape.lower(), []))
+        image_ids = [ image_id for image_id in image_ids if image_id in shape_image_ids ]
+    return image_ids
+
+def list_compute_images():
+    cache = load_cache()
+    image_ids = find_images(cache)
+    if len(image_ids) == 0 and (os_name != None or os_version != None or shape != None):
+        print ("ERROR 03: no image found matching these criteria !")
+        exit (3)
+    if latest:
+        image_ids = image_ids[:1]
+    for image_id in image_ids:
+        print ('{0:100s} {1:s}'.format(image_id, cache["images"][image_id]["display_name"]))
 
 
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) == 2:
-    profile  = sys.argv[1] 
+os_name    = None
+os_version = None
+shape      = None
+latest     = False
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("--"):
+    if   args[0] == "--latest": latest = True
+    elif len(args) < 2: usage()
+    elif args[0] == "--ttl" and args[1].isdigit(): cache_ttl = int(args[1])
+    elif args[0] == "--os":      os_name    = args[1]
+    elif args[0] == "--version": os_version = args[1]
+    elif args[0] == "--shape":   shape      = args[1]
+    else: usage()
+    args = args[1:] if args[0] == "--latest" else args[2:]
+
+if len(args) == 1:
+    profile  = args[0]
 else:
     usage()
 
@@ -60,10 +162,6 @@ except:
     print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
     exit (2)
 
-IdentityClient = oci.identity.IdentityClient(config)
-user = IdentityClient.get_user(config["user"]).data
-RootCompartmentID = user.compartment_id
-
 # -- list images
 list_compute_images()
 
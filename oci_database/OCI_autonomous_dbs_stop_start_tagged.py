@@ -22,6 +22,8 @@
 # Versions
 #    2020-04-23: Initial Version
 #    2020-09-17: bug fix (root compartment was ignored)
+#    2026-10-19: Record the stop/start actions, wait for their completion with --wait and display a summary
+#    2026-10-19: Tracker of actions and pool of clients shared in oci_misc/oci_scripts_common.py (any request error is FAILED)
 # ---------------------------------------------------------------------------------------------------------------------------------
 
 # -- import
@@ -29,6 +31,8 @@ import oci
 import sys
 import os
 from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import get_client, ActionsTracker
 
 # ---------- Tag names, key and value to look for
 # Autonomous DBs tagged using this will be stopped/started.
@@ -39,17 +43,20 @@ tag_key_start = "automatic_startup"
 
 # ---------- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+wait_timeout      = 30          # Max nb of minutes to wait for the completion of the actions (--wait)
+FAILED_STATES     = [ "UNAVAILABLE", "TERMINATING", "TERMINATED" ]  # Lifecycle states of a failed action
 
 # ---------- Functions
 
 # ---- usage syntax
 def usage():
-    print ("Usage: {} [-a] [--confirm_stop] [--confirm_start] OCI_PROFILE".format(sys.argv[0]))
+    print ("Usage: {} [-a] [--confirm_stop] [--confirm_start] [--wait] OCI_PROFILE".format(sys.argv[0]))
     print ("")
     print ("Notes:")
     print ("    If -a is provided, the script processes all active regions instead of singe region provided in profile")
     print ("    If --confirm_stop  is not provided, the autonomous databases to stop are listed but not actually stopped")
     print ("    If --confirm_start is not provided, the autonomous databases to start are listed but not actually started")
+    print ("    If --wait is provided, the script waits (max {} minutes) until the autonomous databases reach the expected state".format(wait_timeout))
     print ("")
     print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
@@ -90,7 +97,7 @@ def process_compartment(lcpt):
                     print ("{:s}, {:s}, {:s}: ".format(datetime.utcnow().strftime("%T"), region, lcpt.name),end='')
                     if confirm_start:
                         print ("STARTING autonomous db {:s} ({:s})".format(adb.display_name, adb.id))
-                        DatabaseClient.start_autonomous_database(adb.id)
+                        submit_action(DatabaseClient.start_autonomous_database, adb.id, adb.display_name, region, "AVAILABLE", adb.id)
                     else:
                         print ("Autonomous DB {:s} ({:s}) SHOULD BE STARTED --> re-run script with --confirm_start to actually start databases".format(adb.display_name, adb.id))
 
@@ -99,53 +106,43 @@ def process_compartment(lcpt):
                     print ("{:s}, {:s}, {:s}: ".format(datetime.utcnow().strftime("%T"), region, lcpt.name),end='')
                     if confirm_stop:
                         print ("STOPPING autonomous db {:s} ({:s})".format(adb.display_name, adb.id))
-                        DatabaseClient.stop_autonomous_database(adb.id)
+                        submit_action(DatabaseClient.stop_autonomous_database, adb.id, adb.display_name, region, "STOPPED", adb.id)
                     else:
                         print ("Autonomous DB {:s} ({:s}) SHOULD BE STOPPED --> re-run script with --confirm_start to actually stop databases".format(adb.display_name, adb.id))
 
   
+# ---- get the current lifecycle state of the autonomous database of an action (tracker of actions)
+def get_action_state(action):
+    return get_client(oci.database.DatabaseClient, dict(config, region=action["region"])).get_autonomous_database(action["id"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.lifecycle_state
+
+# ---- send a stop/start request and record its action in the tracker of actions
+def submit_action(function, resource_id, name, region, target_state, *args):
+    action = actions.submit({ "id": resource_id, "name": name, "description": "autonomous db", "region": region, "target": target_state }, function, *args)
+    if action["status"] == "FAILED":
+        print ("    ERROR: {}".format(action["message"]))
+
 # ------------ main
 
+# -- tracker of the stop/start actions
+actions = ActionsTracker(get_action_state, FAILED_STATES)
+
 # -- parse arguments
 all_regions   = False
 confirm_stop  = False
 confirm_start = False
+wait_actions  = False
 
-if len(sys.argv) == 2:
-    profile  = sys.argv[1] 
-
-elif len(sys.argv) == 3:
-    profile  = sys.argv[2] 
-    if sys.argv[1] == "-a": all_regions = True
-    elif sys.argv[1] == "--confirm_stop":  confirm_stop  = True
-    elif sys.argv[1] == "--confirm_start": confirm_start = True
-    else: usage ()
-
-elif len(sys.argv) == 4:
-    profile  = sys.argv[3] 
-    if   sys.argv[1] == "-a": all_regions = True
-    elif sys.argv[1] == "--confirm_stop":  confirm_stop  = True
-    elif sys.argv[1] == "--confirm_start": confirm_start = True
-    else: usage ()
-    if   sys.argv[2] == "--confirm_stop":  confirm_stop  = True 
-    elif sys.argv[2] == "--confirm_start": confirm_start = True 
-    else: usage ()
-
-elif len(sys.argv) == 5:
-    profile  = sys.argv[4] 
-    if   sys.argv[1] == "-a": all_regions = True
-    elif sys.argv[1] == "--confirm_stop":  confirm_stop  = True
-    elif sys.argv[1] == "--confirm_start": confirm_start = True
-    else: usage ()
-    if   sys.argv[2] == "--confirm_stop":  confirm_stop  = True 
-    elif sys.argv[2] == "--confirm_start": confirm_start = True 
-    else: usage ()
-    if   sys.argv[3] == "--confirm_stop":  confirm_stop  = True 
-    elif sys.argv[3] == "--confirm_start": confirm_start = True 
-    else: usage ()
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("-"):
+    if   args[0] == "-a":              all_regions   = True
+    elif args[0] == "--confirm_stop":  confirm_stop  = True
+    elif args[0] == "--confirm_start": confirm_start = True
+    elif args[0] == "--wait":          wait_actions  = True
+    else: usage()
+    args = args[1:]
 
-else:
-    usage()
+if len(args) != 1: usage()
+profile = args[0]
 
 # -- get UTC time (format 10:00_UTC, 11:00_UTC ...)
 current_utc_time = datetime.utcnow().strftime("%H")+":00_UTC"
@@ -181,18 +178,23 @@ class root_cpt:
     lifecycle_state="AVAILABLE"
 
 if not(all_regions):
-    DatabaseClient = oci.database.DatabaseClient(config)
+    DatabaseClient = get_client(oci.database.DatabaseClient, config)
     process_compartment(root_cpt)
     for cpt in compartments:
         process_compartment(cpt)
 else:
     for region in regions:
         config["region"]=region.region_name
-        DatabaseClient = oci.database.DatabaseClient(config)
+        DatabaseClient = get_client(oci.database.DatabaseClient, config)
         process_compartment(root_cpt)
         for cpt in compartments:
             process_compartment(cpt)
 
+# -- wait for the completion of the actions and display the results
+if wait_actions:
+    actions.wait(wait_timeout, progress=True)
+exit_code = actions.display_summary()
+
 # -- the end
 print ("{:s}: END SCRIPT PID={:d}".format(datetime.utcnow().strftime("%Y/%m/%d %T"),pid))
-exit (0)
+exit (exit_code)
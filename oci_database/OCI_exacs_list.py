@@ -11,12 +11,17 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-12-04: Initial Version
+#    2026-10-19: Reuse SDK clients (one client per service and region) instead of creating one client per call
+#    2026-10-19: Client pool shared in oci_misc/oci_scripts_common.py, only used for the clients created in loops
 # ---------------------------------------------------------------------------------------------------------------
 
 
 # -- import
 import oci
 import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import get_client
 
 # ---------- Colors for output
 # see https://misc.flogisoft.com/bash/tip_colors_and_formatting to customize
@@ -84,7 +89,7 @@ def list_databases(lconfig, ldbh_id, lcpt_id):
     """
     List Databases attached to a given DB home and given compartement
     """
-    DatabaseClient = oci.database.DatabaseClient(lconfig)
+    DatabaseClient = get_client(oci.database.DatabaseClient, lconfig)
     response = DatabaseClient.list_databases(compartment_id=lcpt_id, db_home_id=ldbh_id)
     for db in response.data:
         print ("                   DB : "+COLOR_BLUE+f"{db.db_name:25s} "+COLOR_NORMAL+f"{db.db_workload:15s}", end="")
@@ -103,7 +108,7 @@ def list_dbhomes(lconfig, lvm_cluster_id, lcpt_id):
     """
     List Oracle DB Homes in a given VM cluster and given compartement
     """
-    DatabaseClient = oci.database.DatabaseClient(lconfig)
+    DatabaseClient = get_client(oci.database.DatabaseClient, lconfig)
     response = DatabaseClient.list_db_homes(lcpt_id)
     for dbh in response.data:
         if dbh.vm_cluster_id == lvm_cluster_id:
@@ -121,9 +126,9 @@ def list_vm_clusters(lconfig, exa_infra_id):
     # Query (see https://docs.cloud.oracle.com/en-us/iaas/Content/Search/Concepts/querysyntax.htm)
     query = f"query vmcluster resources"
 
-    DatabaseClient = oci.database.DatabaseClient(lconfig)
+    DatabaseClient = get_client(oci.database.DatabaseClient, lconfig)
 
-    SearchClient = oci.resource_search.ResourceSearchClient(lconfig)
+    SearchClient = get_client(oci.resource_search.ResourceSearchClient, lconfig)
     response = SearchClient.search_resources(oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query))
     for item in response.data.items:
         response2 = DatabaseClient.get_cloud_vm_cluster(item.identifier)
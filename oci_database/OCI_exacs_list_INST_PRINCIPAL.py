@@ -10,12 +10,19 @@
 # prerequisites : - Python 3 with OCI Python SDK installed
 # Versions
 #    2020-12-11: Initial Version
+#    2026-10-19: Reuse SDK clients (one client per service and region) instead of creating one client per call
+#    2026-10-19: Client pool shared in oci_misc/oci_scripts_common.py, only used for the clients created in loops
+#    2026-10-19: Cache the instance principal token in ~/.oci (shared by the *_INST_PRINCIPAL scripts) to skip federation requests
+#    2026-10-19: Token cache moved to oci_misc/oci_scripts_common.py (switch to a new token before the cached one expires)
 # ---------------------------------------------------------------------------------------------------------------
 
 
 # -- import
 import oci
 import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import get_instance_principal_signer, get_client
 
 # ---------- Colors for output
 # see https://misc.flogisoft.com/bash/tip_colors_and_formatting to customize
@@ -74,7 +81,7 @@ def list_databases(lsigner, ldbh_id, lcpt_id):
     """
     List Databases attached to a given DB home and given compartement
     """
-    DatabaseClient = oci.database.DatabaseClient(config={}, signer=lsigner)
+    DatabaseClient = get_client(oci.database.DatabaseClient, {}, lsigner)
     response = DatabaseClient.list_databases(compartment_id=lcpt_id, db_home_id=ldbh_id)
     for db in response.data:
         print ("                   DB : "+COLOR_BLUE+f"{db.db_name:25s} "+COLOR_NORMAL+f"{db.db_workload:15s}", end="")
@@ -93,7 +100,7 @@ def list_dbhomes(lsigner, lvm_cluster_id, lcpt_id):
     """
     List Oracle DB Homes in a given VM cluster and given compartement
     """
-    DatabaseClient = oci.database.DatabaseClient(config={}, signer=lsigner)
+    DatabaseClient = get_client(oci.database.DatabaseClient, {}, lsigner)
     response = DatabaseClient.list_db_homes(lcpt_id)
     for dbh in response.data:
         if dbh.vm_cluster_id == lvm_cluster_id:
@@ -111,9 +118,9 @@ def list_vm_clusters(lsigner, exa_infra_id):
     # Query (see https://docs.cloud.oracle.com/en-us/iaas/Content/Search/Concepts/querysyntax.htm)
     query = f"query vmcluster resources"
 
-    DatabaseClient = oci.database.DatabaseClient(config={}, signer=lsigner)
+    DatabaseClient = get_client(oci.database.DatabaseClient, {}, lsigner)
 
-    SearchClient = oci.resource_search.ResourceSearchClient(config={}, signer=lsigner)
+    SearchClient = get_client(oci.resource_search.ResourceSearchClient, {}, lsigner)
     response = SearchClient.search_resources(oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query))
     for item in response.data.items:
         response2 = DatabaseClient.get_cloud_vm_cluster(item.identifier)
@@ -191,7 +198,7 @@ elif len(sys.argv) == 3:
         usage()  
 
 # -- authentication using instance principal
-signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+signer = get_instance_principal_signer()
 IdentityClient = oci.identity.IdentityClient(config={}, signer=signer)
 RootCompartmentID = signer.tenancy_id
 
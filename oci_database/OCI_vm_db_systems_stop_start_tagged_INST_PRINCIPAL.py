@@ -24,13 +24,19 @@
 # Versions
 #    2020-09-09: Initial Version
 #    2021-01-08: bug fix (ignore DB system if not in AVAILABLE status)
+#    2026-10-19: Import only the OCI SDK services used by the script (faster start)
+#    2026-10-19: Cache the instance principal token in ~/.oci (shared by the *_INST_PRINCIPAL scripts) to skip federation requests
+#    2026-10-19: Token cache moved to oci_misc/oci_scripts_common.py (switch to a new token before the cached one expires)
+#    2026-10-19: Lazy import of OCI SDK moved to oci_misc/oci_scripts_common.py (FIPS mode enabled as with "import oci")
 # ---------------------------------------------------------------------------------------------------------------------------------
 
 # -- import
-import oci
 import sys
 import os
 from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import import_oci_lazily, get_instance_principal_signer
+oci = import_oci_lazily()             # only the OCI SDK services used are imported (faster start)
 
 # ---------- Tag names, key and value to look for
 # VM DB systems tagged using this will be stopped/started.
@@ -148,7 +154,7 @@ pid=os.getpid()
 print ("{:s}: BEGIN SCRIPT PID={:d}".format(datetime.utcnow().strftime("%Y/%m/%d %T"),pid))
 
 # -- authentication using instance principal
-signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+signer = get_instance_principal_signer()
 IdentityClient = oci.identity.IdentityClient(config={}, signer=signer)
 RootCompartmentID = signer.tenancy_id
 
@@ -11,11 +11,16 @@
 # Versions
 #    2020-09-09: Initial Version
 #    2020-12-12: Display full name of compartments (using parents) using colored outputs
+#    2026-10-19: Cache the instance principal token in ~/.oci (shared by the *_INST_PRINCIPAL scripts) to skip federation requests
+#    2026-10-19: Token cache moved to oci_misc/oci_scripts_common.py (switch to a new token before the cached one expires)
 # --------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
 import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import get_instance_principal_signer
 
 # ---------- Colors for output
 # see https://misc.flogisoft.com/bash/tip_colors_and_formatting to customize
@@ -122,7 +127,7 @@ if (len(sys.argv) == 2):
         usage()
 
 # -- authentication using instance principal
-signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+signer = get_instance_principal_signer()
 IdentityClient = oci.identity.IdentityClient(config={}, signer=signer)
 RootCompartmentID = signer.tenancy_id
 
@@ -12,12 +12,17 @@
 #
 # Versions
 #    2020-01-08: Initial Version
+#    2026-10-19: Add bulk operation (SCIM Bulk requests built from a CSV or JSONL manifest)
+#    2026-10-19: Add snapshot operation and --snapshot option to answer list/show operations from a local copy
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import sys
 import base64
+import csv
 import json
+import os
+import time
 import requests
 from pathlib import Path
 from pprint import pprint
@@ -45,18 +50,37 @@ def usage():
     print ("- activate_user username")
     print ("- delete_user username [--confirm]")
     print ("- delete_group groupname [--confirm]")
+    print ("- bulk manifest_file")
+    print ("- snapshot")
     print ("")
     print ("Notes:")
+    print ("  The snapshot operation saves users, groups and group memberships in local file {}".format(SNAPSHOT_FILE))
+    print ("  Option --snapshot max_age_minutes can be added to list_xx and show_xx operations to get the answer from the")
+    print ("  local snapshot (no IDCS request) if it is more recent than max_age_minutes, otherwise IDCS is used")
     print ("  If --confirm is provided in delete_user or delete_group operation, then deletion is done without asking for confirmation")
+    print ("  The bulk manifest is a CSV file (one operation per line, parameters in the same order as above)")
+    print ("  or a JSONL file (.jsonl extension, one JSON object per line). Supported bulk operations:")
+    print ("    add_user, add_group, add_user_to_group, remove_user_from_group, deactivate_user, activate_user")
     print ("")
     print ("Examples:")
     print ("  python3 {} set_credentials idcs-f0f03632a0e346fdaccfaf527xxxxxx xxxxxxxxx xxxxxxxxxxx".format(sys.argv[0]))
+    print ("  python3 {} list_groups_of_user jdoe --snapshot 60".format(sys.argv[0]))
+    print ("  python3 {} bulk new_students.csv".format(sys.argv[0]))
+    print ("      with new_students.csv containing lines like:")
+    print ("        add_group,students_2020,Students of class 2020")
+    print ("        add_user,jdoe,John,Doe,john.doe@example.com")
+    print ("        add_user_to_group,jdoe,students_2020")
+    print ("      or new_students.jsonl containing lines like:")
+    print ("        {\"operation\": \"add_user\", \"username\": \"jdoe\", \"first_name\": \"John\", \"last_name\": \"Doe\", \"email_address\": \"john.doe@example.com\"}")
     exit (1)
 
 
 # -------- variables
 CREDENTIALS_FILE=str(Path.home())+"/.oci/idcs_credentials.python3"
+SNAPSHOT_FILE=str(Path.home())+"/.oci/idcs_snapshot.json"
+SNAPSHOT=None
 MAX_OBJECTS="200"
+BULK_MAX_OPERATIONS=50       # max number of operations sent in a single /admin/v1/Bulk request
 IDCS_END_POINT="xx"
 TOKEN="xx"
 
@@ -68,6 +92,9 @@ def fatal_error(error_number):
   elif (error_number == 5):    print ("ERROR 5: user name not found !")
   elif (error_number == 6):    print ("ERROR 6: group name not found !")
   elif (error_number == 7):    print ("ERROR 7: API request error !")
+  elif (error_number == 8):    print ("ERROR 8: cannot read manifest file !")
+  elif (error_number == 9):    print ("ERROR 9: syntax error in manifest file !")
+  elif (error_number == 10):   print ("ERROR 10: cannot create snapshot file {} !".format(SNAPSHOT_FILE))
   sys.exit (error_number)
 
 # ---- create credentials file
@@ -100,9 +127,12 @@ def get_auth_token(b64code):
     TOKEN = json.loads(r.text)['access_token']
 
 # ---- initialize script
-def init():
+def init(use_snapshot=False):
     global IDCS_END_POINT
 
+    # nothing to do if the answer comes from the local snapshot
+    if use_snapshot: return
+
     try:
         f = open(CREDENTIALS_FILE,"r")
     except:
@@ -117,13 +147,58 @@ def init():
     # get a new Authentication token  
     get_auth_token(base64code)
 
-# ---- get user id from user name
-def get_user_id_from_name(name):
+# ---- load local snapshot if it exists and is more recent than max_age minutes
+def load_snapshot(max_age):
+    global SNAPSHOT
+
+    try:
+        f = open(SNAPSHOT_FILE,"r")
+        snapshot=json.load(f)
+        f.close()
+    except:
+        print ("No usable snapshot in {}, using IDCS".format(SNAPSHOT_FILE), file=sys.stderr)
+        return False
+
+    try:
+        f = open(CREDENTIALS_FILE,"r")
+        idcs_instance=f.readline().rstrip('\n')
+        f.close()
+    except:
+        idcs_instance=snapshot['idcs_instance']
+
+    age=(time.time()-snapshot['timestamp'])/60
+    if (snapshot['idcs_instance'] != idcs_instance):
+        print ("Snapshot was taken from another IDCS instance, using IDCS", file=sys.stderr)
+        return False
+    if (age > max_age):
+        print ("Snapshot is {:.0f} minutes old (more than {} minutes), using IDCS".format(age, max_age), file=sys.stderr)
+        return False
+
+    SNAPSHOT=snapshot
+    return True
+
+# ---- get the list of users (from snapshot if loaded)
+def get_users_list():
+    if SNAPSHOT != None: return [ SNAPSHOT['users'][name] for name in SNAPSHOT['users'] ]
     api_url=IDCS_END_POINT+"/admin/v1/Users?count="+MAX_OBJECTS
     headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
     r = requests.get(api_url, headers=headers)
-    dict=r.json()
-    list=dict['Resources']
+    return r.json()['Resources']
+
+# ---- get the list of groups (from snapshot if loaded)
+def get_groups_list():
+    if SNAPSHOT != None: return [ SNAPSHOT['groups'][name] for name in SNAPSHOT['groups'] ]
+    api_url=IDCS_END_POINT+"/admin/v1/Groups?count="+MAX_OBJECTS
+    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
+    r = requests.get(api_url, headers=headers)
+    return r.json()['Resources']
+
+# ---- get user id from user name
+def get_user_id_from_name(name):
+    if SNAPSHOT != None:
+        if name in SNAPSHOT['users']: return SNAPSHOT['users'][name]['id']
+        fatal_error(5)
+    list=get_users_list()
     for i in range(len(list)):
         if (list[i]['userName'] == name):
             return(list[i]['id'])
@@ -131,11 +206,10 @@ def get_user_id_from_name(name):
 
 # ---- get group id from group name
 def get_group_id_from_name(name):
-    api_url=IDCS_END_POINT+"/admin/v1/Groups?count="+MAX_OBJECTS
-    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
-    r = requests.get(api_url, headers=headers)
-    dict=r.json()
-    list=dict['Resources']
+    if SNAPSHOT != None:
+        if name in SNAPSHOT['groups']: return SNAPSHOT['groups'][name]['id']
+        fatal_error(6)
+    list=get_groups_list()
     for i in range(len(list)):
         if (list[i]['displayName'] == name):
             return(list[i]['id'])
@@ -143,11 +217,7 @@ def get_group_id_from_name(name):
 
 # ---- list users
 def list_users():
-    api_url=IDCS_END_POINT+"/admin/v1/Users?count="+MAX_OBJECTS
-    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
-    r = requests.get(api_url, headers=headers)
-    dict=r.json()
-    list=dict['Resources']
+    list=get_users_list()
     table_headers=['====== USER NAME ======','ACTIVE','====== USER ID ======']
     table_list=[]
     for i in range(len(list)): table_list.append([ list[i]['userName'], list[i]['active'], list[i]['id'] ])
@@ -156,11 +226,7 @@ def list_users():
     print(table)
 
 def list_users_long():
-    api_url=IDCS_END_POINT+"/admin/v1/Users?count="+MAX_OBJECTS
-    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
-    r = requests.get(api_url, headers=headers)
-    dict=r.json()
-    list=dict['Resources']
+    list=get_users_list()
     table_headers=['====== USER NAME ======','ACTIVE','====== USER ID ======','==== TITLE ====','==== CREATION DATE ====','==== CREATED BY ====']
     table_list=[]
     for i in range(len(list)): 
@@ -176,11 +242,7 @@ def list_users_long():
 
 # ---- list groups
 def list_groups():
-    api_url=IDCS_END_POINT+"/admin/v1/Groups?count="+MAX_OBJECTS
-    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
-    r = requests.get(api_url, headers=headers)
-    dict=r.json()
-    list=dict['Resources']
+    list=get_groups_list()
     table_headers=['==== GROUP ID ====','==== GROUP NAME ====']
     table_list=[]
     for i in range(len(list)): table_list.append([ list[i]['id'], list[i]['displayName'] ])
@@ -192,6 +254,9 @@ def list_users_in_group(argv):
     if len(argv) != 3: usage()
     group_name=argv[2]
     group_id=get_group_id_from_name(group_name)
+    if SNAPSHOT != None:
+        for name in SNAPSHOT['users_in_group'][group_name]: print (name)
+        return
     api_url=IDCS_END_POINT+"/admin/v1/Groups/"+group_id+"?attributes=members"
     headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
     r = requests.get(api_url, headers=headers)
@@ -209,6 +274,9 @@ def list_groups_of_user(argv):
     if len(argv) != 3: usage()
     user_name=argv[2]
     user_id=get_user_id_from_name(user_name)
+    if SNAPSHOT != None:
+        for name in SNAPSHOT['groups_of_user'][user_name]: print (name)
+        return
     api_url=IDCS_END_POINT+"/admin/v1/Users/"+user_id+"?attributes=groups"
     headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
     r = requests.get(api_url, headers=headers)
@@ -226,6 +294,9 @@ def show_user(argv):
     if len(argv) != 3: usage()
     user_name=argv[2]
     user_id=get_user_id_from_name(user_name)
+    if SNAPSHOT != None:
+        pprint(SNAPSHOT['users'][user_name])
+        return
     api_url=IDCS_END_POINT+"/admin/v1/Users/"+user_id
     headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
     r = requests.get(api_url, headers=headers)
@@ -237,6 +308,9 @@ def show_group(argv):
     if len(argv) != 3: usage()
     group_name=argv[2]
     group_id=get_group_id_from_name(group_name)
+    if SNAPSHOT != None:
+        pprint(SNAPSHOT['groups'][group_name])
+        return
     api_url=IDCS_END_POINT+"/admin/v1/Groups/"+group_id
     headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
     r = requests.get(api_url, headers=headers)
@@ -401,20 +475,232 @@ def delete_group(argv):
     else:
         fatal_error (7)
 
+# ---- get all users or all groups, reading all pages
+def get_all_resources(resource, parameters):
+    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
+    resources=[]
+    start_index=1
+    while True:
+        api_url=IDCS_END_POINT+"/admin/v1/"+resource+"?count="+MAX_OBJECTS+"&startIndex="+str(start_index)+"&"+parameters
+        r = requests.get(api_url, headers=headers)
+        if (r.status_code != 200): fatal_error(7)
+        dict=r.json()
+        page=dict.get('Resources',[])
+        resources.extend(page)
+        start_index += len(page)
+        if (len(page) == 0) or (start_index > dict['totalResults']): break
+    return resources
+
+# ---- bulk operations: parameters expected for each supported operation
+BULK_PARAMETERS = {
+    "add_user":               [ "username", "first_name", "last_name", "email_address" ],
+    "add_group":              [ "groupname", "description" ],
+    "add_user_to_group":      [ "username", "groupname" ],
+    "remove_user_from_group": [ "username", "groupname" ],
+    "deactivate_user":        [ "username" ],
+    "activate_user":          [ "username" ]
+}
+
+# ---- read bulk manifest (CSV or JSONL) and return a list of operations (dictionaries)
+def read_bulk_manifest(filename):
+    try:
+        f = open(filename,"r")
+    except:
+        fatal_error(8)
+
+    operations=[]
+    line_number=0
+    for line in f:
+        line_number += 1
+        line=line.strip()
+        if (line == "") or line.startswith("#"): continue
+        try:
+            if filename.endswith(".jsonl"):
+                op=json.loads(line)
+            else:
+                fields=next(csv.reader([line]))
+                op={ "operation": fields[0].strip() }
+                for i, parameter in enumerate(BULK_PARAMETERS[op['operation']]):
+                    op[parameter]=fields[i+1].strip()
+            for parameter in BULK_PARAMETERS[op['operation']]:
+                if (op.get(parameter,"") == ""): raise ValueError(parameter)
+        except:
+            print ("Line {}: {}".format(line_number, line))
+            f.close()
+            fatal_error(9)
+        op['line']=line_number
+        op['status']="-"
+        op['result']="not processed"
+        operations.append(op)
+    f.close()
+    return operations
+
+# ---- send a list of SCIM bulk operations in chunks of BULK_MAX_OPERATIONS
+# ---- each element of scim_operations is a tuple (scim_operation, list of manifest operations it covers)
+def send_bulk_requests(scim_operations):
+    api_url=IDCS_END_POINT+"/admin/v1/Bulk"
+    headers = { 'Content-Type': 'application/scim+json', 'Authorization': 'Bearer '+TOKEN }
+    for start in range(0, len(scim_operations), BULK_MAX_OPERATIONS):
+        chunk=scim_operations[start:start+BULK_MAX_OPERATIONS]
+        for i, (scim_op, ops) in enumerate(chunk):
+            scim_op['bulkId']="op"+str(start+i)
+        payload = { "schemas": [ "urn:ietf:params:scim:api:messages:2.0:BulkRequest" ],
+                    "Operations": [ scim_op for (scim_op, ops) in chunk ] }
+        r = requests.post(api_url, headers=headers, data=json.dumps(payload))
+        if (r.status_code != 200):
+            for (scim_op, ops) in chunk:
+                for op in ops:
+                    op['status']=str(r.status_code)
+                    op['result']="Bulk request rejected"
+            continue
+
+        # match results with operations using bulkId (or position if bulkId not returned)
+        results=r.json().get('Operations',[])
+        by_bulk_id={ res['bulkId']: res for res in results if 'bulkId' in res }
+        for i, (scim_op, ops) in enumerate(chunk):
+            if scim_op['bulkId'] in by_bulk_id:
+                res=by_bulk_id[scim_op['bulkId']]
+            elif i < len(results):
+                res=results[i]
+            else:
+                res={ 'status': "-", 'response': { 'detail': "no result returned" } }
+            status=str(res.get('status',"-"))
+            response=res.get('response',{}) or {}
+            for op in ops:
+                op['status']=status
+                if status.startswith("2"):
+                    op['result']="OK"
+                    if 'id' in response: op['id']=response['id']
+                    elif 'location' in res: op['id']=res['location'].rstrip("/").split("/")[-1]
+                else:
+                    op['result']=response.get('detail',"failed")
+
+# ---- execute operations read from a manifest file using SCIM bulk requests
+def bulk(argv):
+    if len(argv) != 3: usage()
+    operations=read_bulk_manifest(argv[2])
+
+    # -- step 1: create groups and users
+    scim_operations=[]
+    for op in operations:
+        if (op['operation'] == "add_group"):
+            data = { "schemas": [ "urn:ietf:params:scim:schemas:core:2.0:Group", "urn:ietf:params:scim:schemas:oracle:idcs:extension:group:Group" ],
+                     "displayName": op['groupname'],
+                     "urn:ietf:params:scim:schemas:oracle:idcs:extension:group:Group": { "creationMechanism": "api", "description": op['description'] } }
+            scim_operations.append(({ "method": "POST", "path": "/Groups", "data": data }, [ op ]))
+        elif (op['operation'] == "add_user"):
+            data = { "schemas": [ "urn:ietf:params:scim:schemas:core:2.0:User" ],
+                     "userName": op['username'],
+                     "name": { "familyName": op['last_name'], "givenName": op['first_name'] },
+                     "emails": [ { "value": op['email_address'], "type": "work", "primary": True } ] }
+            scim_operations.append(({ "method": "POST", "path": "/Users", "data": data }, [ op ]))
+    send_bulk_requests(scim_operations)
+
+    # -- step 2: memberships and user status changes
+    # -- user and group IDs are obtained from a single listing (instead of one listing per operation)
+    others=[ op for op in operations if op['operation'] not in ("add_user", "add_group") ]
+    if len(others) > 0:
+        user_ids ={ u['userName']:    u['id'] for u in get_all_resources("Users",  "attributes=userName") }
+        group_ids={ g['displayName']: g['id'] for g in get_all_resources("Groups", "attributes=displayName") }
+        for op in operations:
+            if (op['operation'] == "add_user")  and ('id' in op): user_ids[op['username']]=op['id']
+            if (op['operation'] == "add_group") and ('id' in op): group_ids[op['groupname']]=op['id']
+
+        # one PATCH per group containing all membership changes for this group
+        patches={}
+        scim_operations=[]
+        for op in others:
+            if (op['username'] not in user_ids):
+                op['result']="user name not found"
+                continue
+            user_id=user_ids[op['username']]
+            if (op['operation'] in ("add_user_to_group", "remove_user_from_group")):
+                if (op['groupname'] not in group_ids):
+                    op['result']="group name not found"
+                    continue
+                group_id=group_ids[op['groupname']]
+                if group_id not in patches:
+                    patches[group_id]={ "schemas": [ "urn:ietf:params:scim:api:messages:2.0:PatchOp" ], "Operations": [] }, []
+                    scim_operations.append(({ "method": "PATCH", "path": "/Groups/"+group_id, "data": patches[group_id][0] }, patches[group_id][1]))
+                if (op['operation'] == "add_user_to_group"):
+                    patches[group_id][0]['Operations'].append({ "op": "add", "path": "members", "value": [ { "value": user_id, "type": "User" } ] })
+                else:
+                    patches[group_id][0]['Operations'].append({ "op": "remove", "path": "members[value eq \""+user_id+"\"]" })
+                patches[group_id][1].append(op)
+            else:
+                data = { "active": (op['operation'] == "activate_user"), "schemas": [ "urn:ietf:params:scim:schemas:oracle:idcs:UserStatusChanger" ] }
+                scim_operations.append(({ "method": "PUT", "path": "/UserStatusChanger/"+user_id, "data": data }, [ op ]))
+        send_bulk_requests(scim_operations)
+
+    # -- display a result for each operation of the manifest
+    table_headers=['LINE','==== OPERATION ====','==== PARAMETERS ====','STATUS','==== RESULT ====']
+    table_list=[]
+    nb_ok=0
+    for op in operations:
+        parameters=" ".join([ op[parameter] for parameter in BULK_PARAMETERS[op['operation']] ])
+        table_list.append([ op['line'], op['operation'], parameters, op['status'], op['result'] ])
+        if (op['result'] == "OK"): nb_ok += 1
+    table = columnar(table_list, table_headers, no_borders=True)
+    print(table)
+    print ("{} operations succeeded, {} operations failed".format(nb_ok, len(operations)-nb_ok))
+
+# ---- save users, groups and group memberships in a local snapshot file
+def snapshot(argv):
+    if len(argv) != 2: usage()
+    users=get_all_resources("Users", "attributeSets=all")
+    groups=get_all_resources("Groups", "attributeSets=all")
+
+    # indexes: users and groups by name, memberships in both directions
+    user_names={ u['id']: u['userName'] for u in users }
+    data = { "idcs_instance":  IDCS_END_POINT.split("//")[1].split(".")[0],
+             "timestamp":      time.time(),
+             "users":          { u['userName']: u for u in users },
+             "groups":         { g['displayName']: g for g in groups },
+             "users_in_group": {},
+             "groups_of_user": { u['userName']: [] for u in users } }
+    for g in groups:
+        members=[ user_names.get(m['value'], m.get('name',m['value'])) for m in g.get('members',[]) if m.get('type',"User") == "User" ]
+        data['users_in_group'][g['displayName']]=sorted(members)
+        for name in members:
+            data['groups_of_user'].setdefault(name,[]).append(g['displayName'])
+    for name in data['groups_of_user']: data['groups_of_user'][name].sort()
+
+    # file created with mode 600 (never readable by others), written to a temporary file then renamed
+    tmp_file="{}.{}.tmp".format(SNAPSHOT_FILE, os.getpid())
+    try:
+        fd=os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, SNAPSHOT_FILE)
+    except:
+        fatal_error(10)
+    print ("Snapshot saved in {}: {} users, {} groups".format(SNAPSHOT_FILE, len(users), len(groups)))
+
 # -------- main
 
 if len(sys.argv) < 2: usage()
 
 operation=sys.argv[1]
 
+# -- optional use of local snapshot for list and show operations (no IDCS request if snapshot is recent enough)
+use_snapshot=False
+if "--snapshot" in sys.argv:
+    i=sys.argv.index("--snapshot")
+    if not(operation.startswith("list_") or operation.startswith("show_")): usage()
+    try:
+        use_snapshot=load_snapshot(int(sys.argv[i+1]))
+    except (IndexError, ValueError):
+        usage()
+    del sys.argv[i:i+2]
+
 if   (operation == "set_credentials"):        set_credentials(sys.argv)
-elif (operation == "list_users"):             init();  list_users()
-elif (operation == "list_users_long"):        init();  list_users_long()
-elif (operation == "list_groups"):            init();  list_groups()
-elif (operation == "list_users_in_group"):    init();  list_users_in_group(sys.argv)
-elif (operation == "list_groups_of_user"):    init();  list_groups_of_user(sys.argv)
-elif (operation == "show_user"):              init();  show_user(sys.argv)
-elif (operation == "show_group"):             init();  show_group(sys.argv)
+elif (operation == "list_users"):             init(use_snapshot);  list_users()
+elif (operation == "list_users_long"):        init(use_snapshot);  list_users_long()
+elif (operation == "list_groups"):            init(use_snapshot);  list_groups()
+elif (operation == "list_users_in_group"):    init(use_snapshot);  list_users_in_group(sys.argv)
+elif (operation == "list_groups_of_user"):    init(use_snapshot);  list_groups_of_user(sys.argv)
+elif (operation == "show_user"):              init(use_snapshot);  show_user(sys.argv)
+elif (operation == "show_group"):             init(use_snapshot);  show_group(sys.argv)
 elif (operation == "add_user"):               init();  add_user(sys.argv)
 elif (operation == "add_group"):              init();  add_group(sys.argv)
 elif (operation == "add_user_to_group"):      init();  add_user_to_group(sys.argv)
@@ -423,6 +709,8 @@ elif (operation == "deactivate_user"):        init();  deactivate_user(sys.argv)
 elif (operation == "activate_user"):          init();  activate_user(sys.argv)
 elif (operation == "delete_user"):            init();  delete_user(sys.argv)
 elif (operation == "delete_group"):           init();  delete_group(sys.argv)
+elif (operation == "bulk"):                   init();  bulk(sys.argv)
+elif (operation == "snapshot"):               init();  snapshot(sys.argv)
 else: usage()
 
 exit (0)
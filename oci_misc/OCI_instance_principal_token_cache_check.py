@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# --------------------------------------------------------------------------------------------------------------------------
+# This script checks the instance principal token cache of oci_scripts_common.py (used by the *_INST_PRINCIPAL scripts)
+# without an OCI instance: a cache file is created in a temporary folder with a generated key and token, then
+# - the signer returned by get_instance_principal_signer() is accepted by an IdentityClient (config={}, signer=signer)
+# - requests (GET, POST and without content headers) are signed with the cached token
+# - once a federation client is available (simulated), requests are signed with its token and HTTP 401 refreshes it
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+# Versions
+#    2026-10-19: Initial Version
+# --------------------------------------------------------------------------------------------------------------------------
+
+# -- import
+import os
+import json
+import time
+import base64
+import tempfile
+import oci_scripts_common
+from oci_scripts_common import import_oci_lazily, get_instance_principal_signer
+oci = import_oci_lazily()
+from oci._vendor import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.backends import default_backend
+
+# ---------- variables
+region     = "eu-frankfurt-1"
+tenancy_id = "ocid1.tenancy.oc1..aaaaaaaacheck"
+nb_errors  = 0
+
+# ---------- Functions
+
+# ---- display the result of a check
+def check(description, result):
+    global nb_errors
+    print ("{:70s} {}".format(description, "OK" if result else "FAILED"))
+    if not(result): nb_errors += 1
+
+# ---- build a security token (JWT) valid for the given number of seconds
+def new_token(name, validity):
+    payload = base64.urlsafe_b64encode(json.dumps({ "sub": name, "exp": int(time.time()) + validity }).encode()).decode().rstrip("=")
+    return "eyJhbGciOiJSUzI1NiJ9.{}.signature".format(payload)
+
+# ---- sign a request with the signer of a client and return the Authorization header
+def signed_authorization(signer, method, body=None):
+    request = requests.Request(method, "https://identity.{}.oraclecloud.com/20160918/regions".format(region), data=body).prepare()
+    signer(request)
+    return request.headers["authorization"]
+
+# ---- simulated federation client (token and session key of a new instance principal signer)
+class FederationClient:
+    def __init__(self, key):
+        self.token = new_token("federation", 3600)
+        self.nb_refreshes = 0
+        self.session_key_supplier = self
+        self.key = key
+    def get_key_pair(self):
+        return { "private": self.key, "public": self.key.public_key() }
+    def get_security_token(self):
+        return self.token
+    def refresh_security_token(self):
+        self.nb_refreshes += 1
+        self.token = new_token("refreshed", 3600)
+        return self.token
+
+# ------------ main
+
+# -- create a cache file with a generated key and a token valid for 1 hour
+folder = tempfile.mkdtemp()
+oci_scripts_common.INST_PRINCIPAL_CACHE_FILE = os.path.join(folder, "instance_principal_token.json")
+key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+cached_token = new_token("cached", 3600)
+with open(oci_scripts_common.INST_PRINCIPAL_CACHE_FILE, "w") as f:
+    json.dump({ "token": cached_token,
+                "private_key": key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()).decode(),
+                "region": region,
+                "tenancy_id": tenancy_id,
+                "expires": int(time.time()) + 3600 }, f)
+
+# -- signer from the cache and client
+print ("OCI Python SDK version {}".format(oci.__version__))
+signer = get_instance_principal_signer()
+check ("Signer is an SDK instance principal signer", isinstance(signer, oci.auth.signers.InstancePrincipalsSecurityTokenSigner))
+check ("Signer region and tenancy from the cache", signer.region == region and signer.tenancy_id == tenancy_id)
+try:
+    IdentityClient = oci.identity.IdentityClient(config={}, signer=signer)
+    check ("IdentityClient created with config={} and the cached signer", region in IdentityClient.base_client.endpoint)
+except Exception as error:
+    check ("IdentityClient created with config={{}} and the cached signer ({})".format(repr(error)), False)
+    exit (2)
+
+# -- requests signed with the cached token
+client_signer = IdentityClient.base_client.signer
+check ("GET request signed with the cached token", "ST${}".format(cached_token) in signed_authorization(client_signer, "GET"))
+check ("POST request signed with the cached token", "ST${}".format(cached_token) in signed_authorization(client_signer, "POST", "{}"))
+check ("Request signed without content headers", "ST${}".format(cached_token) in signed_authorization(client_signer.without_content_headers, "POST", "{}"))
+
+# -- federation client (cached token about to expire or rejected): its token is used and refreshed on HTTP 401
+federation_client = FederationClient(key)
+signer.federation_client = federation_client
+check ("Request signed with the token of the federation client", "ST${}".format(federation_client.token) in signed_authorization(client_signer, "GET"))
+signer.refresh_security_token()
+check ("Token refreshed on HTTP 401", federation_client.nb_refreshes == 1 and "ST${}".format(federation_client.token) in signed_authorization(client_signer, "GET"))
+with open(oci_scripts_common.INST_PRINCIPAL_CACHE_FILE, "r") as f:
+    check ("Refreshed token saved in the cache file", json.load(f)["token"] == federation_client.token)
+check ("Cache file mode 600", (os.stat(oci_scripts_common.INST_PRINCIPAL_CACHE_FILE).st_mode & 0o777) == 0o600)
+
+# -- the end
+if nb_errors > 0:
+    print ("ERROR 03: {} checks failed !".format(nb_errors))
+    exit (3)
+exit (0)
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 
 # --------------------------------------------------------------------------------------------
-# This script adds a defined tag key and value (using tag namespace) to an OCI resource/object
+# This script adds a defined tag key and value (using tag namespace) to an OCI resource/object
+# or to a list of OCI resources/objects (bulk mode)
 #
 # Supported resource types:
 # - COMPUTE: instance
 # - DATABASE: dbsystem, autonomous database
-# 
+#
 # Note: OCI tenant and region given by an OCI CLI PROFILE
 # Author        : Christophe Pauliat
 # Platforms     : MacOS / Linux
@@ -18,6 +19,10 @@
 #    2020-05-04: Fix bug if tag namespace not already used for this object
 #    2020-05-04: Simplify code
 #    2020-09-18: Fix bug for automous database
+#    2026-10-19: Add bulk mode (OCIDs from a file, stdin or a search query) with parallel updates
+#    2026-10-19: Add --work_requests option to use bulk tagging work requests (one per compartment)
+#    2026-10-19: Bulk mode moved to OCI_objects_bulk_tag.py (shared with OCI_object_remove_tag.py)
+#    2026-10-19: Bulk mode done in the same process by bulk_tag() of OCI_objects_bulk_tag.py
 #
 # TO DO: add support for more resource types
 # --------------------------------------------------------------------------------------------
@@ -25,6 +30,7 @@
 # -- import
 import oci
 import sys
+from OCI_objects_bulk_tag import is_bulk_mode, bulk_tag
 
 # ---------- Functions
 
@@ -34,9 +40,18 @@ configfile = "~/.oci/config"    # Define config file to be used.
 # ---- usage syntax
 def usage():
     print ("Usage: {} OCI_PROFILE object_ocid tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --file ocids_file tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --stdin tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --query search_query tag_namespace tag_key tag_value".format(sys.argv[0]))
     print ("")
-    print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- In bulk mode (--file, --stdin or --query), OCIDs are read from a file or stdin (one OCID per line)")
+    print ("  or from the results of a Resource Search query in the region of the profile, for example:")
+    print ("  \"query instance resources where lifecycleState = 'RUNNING'\"")
+    print ("- Bulk mode is done by OCI_objects_bulk_tag.py (same directory): resources are updated in parallel")
+    print ("  (10 threads by default, change it with --threads) or, with --work_requests, the tag is added")
+    print ("  using bulk edit tags work requests (one per compartment) which are then monitored until completion")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -50,50 +65,48 @@ def usage():
 
 def update_tags(ltags):
     if tag_ns in ltags:     # tag namespace already used in this object
-        ltags[tag_ns][tag_key] = tag_value        
+        ltags[tag_ns][tag_key] = tag_value
     else:                   # tag namespace not yet used in this object
-        ltags[tag_ns] = { tag_key : tag_value }   
+        ltags[tag_ns] = { tag_key : tag_value }
     return (ltags)
 
-def add_tag_compute_instance(inst_id):
-    ComputeClient = oci.core.ComputeClient(config)
-    try:
-        response = ComputeClient.get_instance(inst_id)
-        tags = update_tags(response.data.defined_tags)
-        ComputeClient.update_instance(inst_id, oci.core.models.UpdateInstanceDetails(defined_tags=tags))
-    except:
-        print (sys.exc_info()[1].message)
-        exit (3)
+def add_tag_compute_instance(ComputeClient, inst_id):
+    response = ComputeClient.get_instance(inst_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    tags = update_tags(response.data.defined_tags)
+    ComputeClient.update_instance(inst_id, oci.core.models.UpdateInstanceDetails(defined_tags=tags), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
 
-def add_tag_db_system(dbs_id):
-    DatabaseClient = oci.database.DatabaseClient(config)
-    try:
-        response = DatabaseClient.get_db_system(dbs_id)
-        tags = update_tags(response.data.defined_tags)
-        DatabaseClient.update_db_system(dbs_id, oci.database.models.UpdateDbSystemDetails(defined_tags=tags))
-    except:
-        print (sys.exc_info()[1].message)
-        exit (3)
+def add_tag_db_system(DatabaseClient, dbs_id):
+    response = DatabaseClient.get_db_system(dbs_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    tags = update_tags(response.data.defined_tags)
+    DatabaseClient.update_db_system(dbs_id, oci.database.models.UpdateDbSystemDetails(defined_tags=tags), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
 
-def add_tag_autonomous_db(adb_id):
-    DatabaseClient = oci.database.DatabaseClient(config)
-    try:
-        response = DatabaseClient.get_autonomous_database(adb_id)
-        tags = update_tags(response.data.defined_tags)
-        DatabaseClient.update_autonomous_database(adb_id, oci.database.models.UpdateAutonomousDatabaseDetails(defined_tags=tags))
-    except:
-        print (sys.exc_info()[1].message)
-        exit (3)
+def add_tag_autonomous_db(DatabaseClient, adb_id):
+    response = DatabaseClient.get_autonomous_database(adb_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    tags = update_tags(response.data.defined_tags)
+    DatabaseClient.update_autonomous_database(adb_id, oci.database.models.UpdateAutonomousDatabaseDetails(defined_tags=tags), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+
+# ---- supported resource types: OCID type -> (service client, function adding the tag)
+RESOURCE_TYPES = {
+    "instance":           (oci.core.ComputeClient,      add_tag_compute_instance),
+    "dbsystem":           (oci.database.DatabaseClient, add_tag_db_system),
+    "autonomousdatabase": (oci.database.DatabaseClient, add_tag_autonomous_db)
+}
 
 # ------------ main
 
+# -- bulk mode (--file, --stdin or --query): done by function bulk_tag() of OCI_objects_bulk_tag.py
+args = sys.argv[1:]
+if is_bulk_mode(args):
+    bulk_tag("--add", args, usage)
+    exit (0)
+
 # -- parse arguments
-if len(sys.argv) == 6:
-    profile  = sys.argv[1]
-    obj_id   = sys.argv[2] 
-    tag_ns   = sys.argv[3]
-    tag_key  = sys.argv[4]
-    tag_value= sys.argv[5]
+if len(args) == 5 and not(args[0].startswith("-")):
+    profile  = args[0]
+    obj_id   = args[1]
+    tag_ns   = args[2]
+    tag_key  = args[3]
+    tag_value= args[4]
 else:
     usage()
 
@@ -105,17 +118,17 @@ except:
     print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
     exit (2)
 
-IdentityClient = oci.identity.IdentityClient(config)
-user = IdentityClient.get_user(config["user"]).data
-RootCompartmentID = user.compartment_id
-
 # -- Get the resource type from OCID
 obj_type = obj_id.split(".")[1].lower()
 
-if   obj_type == "instance":           add_tag_compute_instance(obj_id)
-elif obj_type == "dbsystem":           add_tag_db_system(obj_id)
-elif obj_type == "autonomousdatabase": add_tag_autonomous_db(obj_id)
-else: print ("SORRY: resource type {:s} is not yet supported by this script !".format(obj_type)) 
+if obj_type in RESOURCE_TYPES:
+    client_class, add_tag_function = RESOURCE_TYPES[obj_type]
+    try:
+        add_tag_function(client_class(config), obj_id)
+    except:
+        print (sys.exc_info()[1].message)
+        exit (3)
+else: print ("SORRY: resource type {:s} is not yet supported by this script !".format(obj_type))
 
 # -- the end
 exit (0)
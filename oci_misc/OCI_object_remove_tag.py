@@ -2,6 +2,7 @@
 
 # --------------------------------------------------------------------------------------------
 # This script removes a defined tag key (using tag namespace) from an OCI resource/object
+# or from a list of OCI resources/objects (bulk mode)
 #
 # Supported resource types:
 # - COMPUTE            : instance, custom image, boot volume
@@ -18,6 +19,10 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-04-27: Initial Version
+#    2026-10-19: Add bulk mode (OCIDs from a file, stdin or a search query) with parallel updates using ETags
+#    2026-10-19: Add --work_requests option to use bulk tagging work requests (one per compartment)
+#    2026-10-19: Bulk mode moved to OCI_objects_bulk_tag.py (shared with OCI_object_add_tag.py)
+#    2026-10-19: Bulk mode done in the same process by bulk_tag() of OCI_objects_bulk_tag.py
 #
 # TO DO: add support for more resource types
 # --------------------------------------------------------------------------------------------
@@ -25,6 +30,7 @@
 # -- import
 import oci
 import sys
+from OCI_objects_bulk_tag import is_bulk_mode, bulk_tag
 
 # ---------- Functions
 
@@ -34,9 +40,19 @@ configfile = "~/.oci/config"    # Define config file to be used.
 # ---- usage syntax
 def usage():
     print ("Usage: {} OCI_PROFILE object_ocid tag_namespace tag_key".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --file ocids_file tag_namespace tag_key".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --stdin tag_namespace tag_key".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] OCI_PROFILE --query search_query tag_namespace tag_key".format(sys.argv[0]))
     print ("")
-    print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- In bulk mode (--file, --stdin or --query), OCIDs are read from a file or stdin (one OCID per line)")
+    print ("  or from the results of a Resource Search query in the region of the profile, for example:")
+    print ("  \"query all resources where (definedTags.namespace = 'ns' && definedTags.key = 'key')\"")
+    print ("- Bulk mode is done by OCI_objects_bulk_tag.py (same directory): resources are updated in parallel")
+    print ("  (10 threads by default, change it with --threads) using the ETag of each resource (re-read and retried")
+    print ("  if the resource was modified in the meantime) or, with --work_requests, the tag is removed")
+    print ("  using bulk edit tags work requests (one per compartment) which are then monitored until completion")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -356,15 +372,20 @@ def remove_tag_from_route_table(rt_id, ltag_ns, ltag_key):
         print (sys.exc_info()[1].message)
         exit (6)
 
-
 # ------------ main
 
+# -- bulk mode (--file, --stdin or --query): done by function bulk_tag() of OCI_objects_bulk_tag.py
+args = sys.argv[1:]
+if is_bulk_mode(args):
+    bulk_tag("--remove", args, usage)
+    exit (0)
+
 # -- parse arguments
-if len(sys.argv) == 5:
-    profile  = sys.argv[1]
-    obj_id   = sys.argv[2] 
-    tag_ns   = sys.argv[3]
-    tag_key  = sys.argv[4]
+if len(args) == 4 and not(args[0].startswith("-")):
+    profile  = args[0]
+    obj_id   = args[1]
+    tag_ns   = args[2]
+    tag_key  = args[3]
 else:
     usage()
 
@@ -2,6 +2,7 @@
 
 # ----------------------------------------------------------------------------------------------------------
 # This script show defined tags for an OCI resource/object
+# or for a list of OCI resources/objects (batch mode)
 #
 # Supported resource types:
 # - COMPUTE            : instance, custom image, boot volume
@@ -19,25 +20,42 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-04-28: Initial Version
+#    2026-10-19: Add batch mode (OCIDs from a file or stdin) with table or JSONL output
+#    2026-10-19: Import only the OCI SDK services used by the script (faster start)
+#    2026-10-19: Lazy import of OCI SDK moved to oci_misc/oci_scripts_common.py (FIPS mode enabled as with "import oci")
+#    2026-10-19: Batch mode clients taken from the pool of oci_misc/oci_scripts_common.py
+#    2026-10-19: get_region() and read_ocids() moved to oci_misc/oci_scripts_common.py
 #
 # TO DO: add support for more resource types
 # ----------------------------------------------------------------------------------------------------------
 
 # -- import
-import oci
 import sys
+import os
+import json
+import concurrent.futures
+from oci_scripts_common import import_oci_lazily, get_client, get_region_names, get_region, read_ocids
+oci = import_oci_lazily()             # only the OCI SDK services used are imported (faster start)
 
 # ---------- Functions
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of parallel requests in batch mode
+search_batch_size = 50          # Nb of OCIDs looked up in a single Resource Search query in batch mode
 
 # ---- usage syntax
 def usage():
     print ("Usage: {} OCI_PROFILE object_ocid".format(sys.argv[0]))
+    print ("    or {} [--jsonl] OCI_PROFILE --file ocids_file".format(sys.argv[0]))
+    print ("    or {} [--jsonl] OCI_PROFILE --stdin".format(sys.argv[0]))
     print ("")
-    print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- In batch mode (--file or --stdin), OCIDs are read from a file or stdin (one OCID per line)")
+    print ("  Tags are read using Resource Search queries ({} OCIDs per query) in the region of each object".format(search_batch_size))
+    print ("  and, for objects not found by Resource Search, with a GET request on the object (in parallel)")
+    print ("- Tags are displayed as a table (one namespace.key=value per line) or as JSON lines with --jsonl")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -269,14 +287,123 @@ def show_tags_from_service_gateway(sg_id):
         print ("ERROR 03: Service gateway with OCID '{}' not found !".format(sg_id))
         exit (3)
 
+# ---- batch mode: supported resource types for GET requests: OCID type -> (SDK service, client class, get method)
+# ---- (names only: the SDK services are imported only when used)
+BATCH_RESOURCE_TYPES = {
+    "instance":            ("core",     "ComputeClient",        "get_instance"),
+    "image":               ("core",     "ComputeClient",        "get_image"),
+    "bootvolume":          ("core",     "BlockstorageClient",   "get_boot_volume"),
+    "volume":              ("core",     "BlockstorageClient",   "get_volume"),
+    "volumebackup":        ("core",     "BlockstorageClient",   "get_volume_backup"),
+    "dbsystem":            ("database", "DatabaseClient",       "get_db_system"),
+    "autonomousdatabase":  ("database", "DatabaseClient",       "get_autonomous_database"),
+    "vcn":                 ("core",     "VirtualNetworkClient", "get_vcn"),
+    "subnet":              ("core",     "VirtualNetworkClient", "get_subnet"),
+    "routetable":          ("core",     "VirtualNetworkClient", "get_route_table"),
+    "internetgateway":     ("core",     "VirtualNetworkClient", "get_internet_gateway"),
+    "drg":                 ("core",     "VirtualNetworkClient", "get_drg"),
+    "networksecuritygroup":("core",     "VirtualNetworkClient", "get_network_security_group"),
+    "securitylist":        ("core",     "VirtualNetworkClient", "get_security_list"),
+    "dhcpoptions":         ("core",     "VirtualNetworkClient", "get_dhcp_options"),
+    "localpeeringgateway": ("core",     "VirtualNetworkClient", "get_local_peering_gateway"),
+    "natgateway":          ("core",     "VirtualNetworkClient", "get_nat_gateway"),
+    "servicegateway":      ("core",     "VirtualNetworkClient", "get_service_gateway")
+}
+
+# ---- batch mode: get defined tags of a batch of resources in a region with a single Resource Search query
+def search_tags(region, ocids):
+    query = "query all resources where " + " || ".join([ "identifier = '{}'".format(ocid) for ocid in ocids ])
+    try:
+        response = oci.pagination.list_call_get_all_results(get_client(oci.resource_search.ResourceSearchClient, dict(config, region=region)).search_resources, oci.resource_search.models.StructuredSearchDetails(query=query), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        return { resource.identifier: resource.defined_tags for resource in response.data }
+    except oci.exceptions.ServiceError:
+        return {}
+
+# ---- batch mode: get defined tags of a resource with a GET request (resources not found by Resource Search)
+def get_tags(obj_id):
+    obj_type = obj_id.split(".")[1].lower()
+    if obj_type not in BATCH_RESOURCE_TYPES:
+        return "resource type not supported"
+    service, client_name, get_method = BATCH_RESOURCE_TYPES[obj_type]
+    try:
+        client = get_client(getattr(getattr(oci, service), client_name), dict(config, region=get_region(obj_id, config, region_names)))
+        response = getattr(client, get_method)(obj_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        return response.data.defined_tags
+    except oci.exceptions.ServiceError as error:
+        return "{} {}".format(error.status, error.message)
+
+# ---- batch mode: flatten defined tags as namespace.key=value
+def flatten_tags(defined_tags):
+    return [ ("{}.{}".format(namespace, key), value) for namespace in sorted(defined_tags) for key, value in sorted(defined_tags[namespace].items()) ]
+
+# ---- batch mode: get and display tags of all resources
+def show_tags_batch(ocids):
+    global region_names
+    region_names = get_region_names(config)
+
+    # group OCIDs by region
+    ocids_per_region = {}
+    for obj_id in set(ocids):
+        try:
+            ocids_per_region.setdefault(get_region(obj_id, config, region_names), []).append(obj_id)
+        except:
+            pass
+
+    # get tags with Resource Search queries in each region (batches of OCIDs), in parallel
+    tags = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        futures = [ executor.submit(search_tags, region, region_ocids[i:i+search_batch_size]) for region, region_ocids in ocids_per_region.items() for i in range(0, len(region_ocids), search_batch_size) ]
+        for future in concurrent.futures.as_completed(futures):
+            tags.update(future.result())
+
+    # get tags of resources not found by Resource Search with GET requests (grouped by type and region), in parallel
+    remaining = sorted([ obj_id for region_ocids in ocids_per_region.values() for obj_id in region_ocids if obj_id not in tags ], key=lambda obj_id: (obj_id.split(".")[1], get_region(obj_id, config, region_names)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        for obj_id, result in zip(remaining, executor.map(get_tags, remaining)):
+            tags[obj_id] = result
+
+    # display results in the order of the input
+    nb_errors = 0
+    if not(jsonl):
+        print ("{:100s} {:22s} {}".format("OCID", "TYPE", "TAG"))
+    for obj_id in ocids:
+        result = tags.get(obj_id, "invalid OCID")
+        obj_type = obj_id.split(".")[1].lower() if obj_id.count(".") >= 4 else "?"
+        if isinstance(result, str):
+            nb_errors += 1
+        if jsonl:
+            if isinstance(result, str):
+                print (json.dumps({ "id": obj_id, "type": obj_type, "error": result }))
+            else:
+                print (json.dumps({ "id": obj_id, "type": obj_type, "tags": dict(flatten_tags(result)) }))
+        elif isinstance(result, str):
+            print ("{:100s} {:22s} ERROR: {}".format(obj_id, obj_type, result))
+        elif len(result) == 0:
+            print ("{:100s} {:22s} -".format(obj_id, obj_type))
+        else:
+            for tag, value in flatten_tags(result):
+                print ("{:100s} {:22s} {}={}".format(obj_id, obj_type, tag, value))
+    if nb_errors > 0:
+        exit (4)
+
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) == 3:
-    profile = sys.argv[1]
-    obj_id  = sys.argv[2] 
-else:
+args = sys.argv[1:]
+jsonl = False
+if len(args) > 0 and args[0] == "--jsonl":
+    jsonl = True
+    args = args[1:]
+
+batch_source = None
+if len(args) == 3 and args[1] == "--file":
+    batch_source = args[2]
+elif len(args) == 2 and args[1] == "--stdin":
+    batch_source = sys.stdin
+elif len(args) != 2 or jsonl:
     usage()
+profile = args[0]
+obj_id  = args[1]
 
 # -- load profile from config file
 try:
@@ -286,6 +413,21 @@ except:
     print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
     exit (2)
 
+# -- Batch mode
+if batch_source != None:
+    region_names = {}
+    if batch_source == sys.stdin:
+        ocids = read_ocids(sys.stdin)
+    else:
+        try:
+            with open(batch_source, "r") as f:
+                ocids = read_ocids(f)
+        except OSError:
+            print ("ERROR 05: cannot read file {} !".format(batch_source))
+            exit (5)
+    show_tags_batch(ocids)
+    exit (0)
+
 IdentityClient = oci.identity.IdentityClient(config)
 user = IdentityClient.get_user(config["user"]).data
 RootCompartmentID = user.compartment_id
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+
+# --------------------------------------------------------------------------------------------
+# This script adds a defined tag key and value (using tag namespace) to a list of OCI
+# resources/objects or removes a defined tag key from a list of OCI resources/objects
+# OCIDs are read from a file, from stdin or from the results of a Resource Search query
+# Used by OCI_object_add_tag.py and OCI_object_remove_tag.py for their bulk mode (function bulk_tag())
+#
+# Supported resource types:
+# - COMPUTE            : instance, custom image, boot volume
+# - BLOCK STORAGE      : block volume
+# - DATABASE           : dbsystem, autonomous database
+# - NETWORKING         : vcn, subnet, security list, route table
+# (with --work_requests: all resource types supported by bulk edit tags)
+#
+# Note: OCI tenant and region given by an OCI CLI PROFILE
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+#                 - OCI config file configured with profiles
+# Versions
+#    2026-10-19: Initial Version (bulk mode of OCI_object_add_tag.py and OCI_object_remove_tag.py)
+#    2026-10-19: Clients of each region taken from the pool of oci_misc/oci_scripts_common.py
+#    2026-10-19: get_region() and read_ocids() moved to oci_misc/oci_scripts_common.py
+#    2026-10-19: Bulk mode in function bulk_tag() called by OCI_object_add_tag.py and OCI_object_remove_tag.py (no new process)
+# --------------------------------------------------------------------------------------------
+
+# -- import
+import oci
+import sys
+import time
+import concurrent.futures
+from oci_scripts_common import get_client, get_region_names, get_region, read_ocids
+
+# ---------- Colors for output
+COLOR_YELLOW="\033[93m"
+COLOR_RED="\033[91m"
+COLOR_GREEN="\033[32m"
+COLOR_NORMAL="\033[39m"
+
+# ---------- Functions
+
+# ---- variables
+configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of resources updated in parallel
+bulk_edit_max_resources = 100   # Max nb of resources in a bulk edit tags work request
+search_batch_size = 50          # Nb of OCIDs looked up in a single Resource Search query (--work_requests)
+poll_interval = 5               # Nb of seconds between 2 checks of the work requests status (--work_requests)
+wait_timeout = 60               # Max nb of minutes to wait for the completion of the work requests (--work_requests)
+max_retries_412 = 5             # Max nb of re-reads when a resource was modified by someone else (HTTP 412)
+
+# ---- usage syntax
+def usage():
+    print ("Usage: {} [--threads N | --work_requests] --add OCI_PROFILE --file ocids_file|--stdin|--query search_query tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("    or {} [--threads N | --work_requests] --remove OCI_PROFILE --file ocids_file|--stdin|--query search_query tag_namespace tag_key".format(sys.argv[0]))
+    print ("")
+    print ("Notes: ")
+    print ("- OCIDs are read from a file or stdin (one OCID per line)")
+    print ("  or from the results of a Resource Search query in the region of the profile, for example:")
+    print ("  \"query all resources where (definedTags.namespace = 'ns' && definedTags.key = 'key')\"")
+    print ("- Resources are updated in parallel ({} threads by default, change it with --threads)".format(nb_threads))
+    print ("  Each update is conditional (ETag of the resource read just before): if the resource was modified")
+    print ("  in the meantime, it is read again and the update is retried (up to {} times)".format(max_retries_412))
+    print ("- With --work_requests, resources are grouped by compartment and updated by bulk edit tags work requests")
+    print ("  (up to {} resources per work request) which are then monitored until completion".format(bulk_edit_max_resources))
+    print ("  or for up to {} minutes: work requests not completed by then are reported with status TIMEOUT".format(wait_timeout))
+    print ("  Compartment and type of the resources are found using Resource Search (region of the profile)")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("")
+    print ("[EMEAOSCf]")
+    print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("user        = ocid1.user.oc1..aaaaaaaayblfepjieoxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("fingerprint = 19:1d:7b:3a:17:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx")
+    print ("key_file    = /Users/cpauliat/.oci/api_key.pem")
+    print ("region      = eu-frankfurt-1")
+    exit (1)
+
+# ---- supported resource types: OCID type -> (client class, get method, update method, update details model)
+RESOURCE_TYPES = {
+    "instance":           (oci.core.ComputeClient,           "get_instance",            "update_instance",            oci.core.models.UpdateInstanceDetails),
+    "image":              (oci.core.ComputeClient,           "get_image",               "update_image",               oci.core.models.UpdateImageDetails),
+    "bootvolume":         (oci.core.BlockstorageClient,      "get_boot_volume",         "update_boot_volume",         oci.core.models.UpdateBootVolumeDetails),
+    "volume":             (oci.core.BlockstorageClient,      "get_volume",              "update_volume",              oci.core.models.UpdateVolumeDetails),
+    "dbsystem":           (oci.database.DatabaseClient,      "get_db_system",           "update_db_system",           oci.database.models.UpdateDbSystemDetails),
+    "autonomousdatabase": (oci.database.DatabaseClient,      "get_autonomous_database", "update_autonomous_database", oci.database.models.UpdateAutonomousDatabaseDetails),
+    "vcn":                (oci.core.VirtualNetworkClient,    "get_vcn",                 "update_vcn",                 oci.core.models.UpdateVcnDetails),
+    "subnet":             (oci.core.VirtualNetworkClient,    "get_subnet",              "update_subnet",              oci.core.models.UpdateSubnetDetails),
+    "securitylist":       (oci.core.VirtualNetworkClient,    "get_security_list",       "update_security_list",       oci.core.models.UpdateSecurityListDetails),
+    "routetable":         (oci.core.VirtualNetworkClient,    "get_route_table",         "update_route_table",         oci.core.models.UpdateRouteTableDetails)
+}
+
+# ---- add or remove the tag key: read the resource, then update it only if it was not modified since (if_match)
+# ---- if it was modified (HTTP 412), read it again and retry
+def edit_tag_etag(client, get_method, update_method, details_model, obj_id):
+    for attempt in range(max_retries_412 + 1):
+        response = getattr(client, get_method)(obj_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        etag = response.headers["etag"]
+        tags = response.data.defined_tags
+        if operation == "--add":
+            if tag_ns in tags and tags[tag_ns].get(tag_key) == tag_value:
+                return "SKIPPED", "tag already set to this value"
+            tags.setdefault(tag_ns, {})[tag_key] = tag_value
+        else:
+            if tag_ns not in tags or tag_key not in tags[tag_ns]:
+                return "SKIPPED", "tag key not present"
+            del tags[tag_ns][tag_key]
+        try:
+            getattr(client, update_method)(obj_id, details_model(defined_tags=tags), if_match=etag, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+            return "OK", "" if attempt == 0 else "{} re-read(s) after concurrent modification".format(attempt)
+        except oci.exceptions.ServiceError as error:
+            if error.status != 412:
+                raise
+    return "FAILED", "resource still modified after {} re-reads".format(max_retries_412)
+
+# ---- add or remove the tag key for a resource and return the result
+def edit_tag(obj_id):
+    try:
+        obj_type = obj_id.split(".")[1].lower()
+        region   = get_region(obj_id, config, region_names)
+    except:
+        return obj_id, "?", "?", "FAILED", "invalid OCID"
+    if obj_type not in RESOURCE_TYPES:
+        return obj_id, obj_type, region, "SKIPPED", "resource type not supported"
+    client_class, get_method, update_method, details_model = RESOURCE_TYPES[obj_type]
+    try:
+        status, message = edit_tag_etag(get_client(client_class, dict(config, region=region)), get_method, update_method, details_model, obj_id)
+        return obj_id, obj_type, region, status, message
+    except oci.exceptions.ServiceError as error:
+        return obj_id, obj_type, region, "FAILED", "{} {}".format(error.status, error.message)
+    except Exception as error:
+        return obj_id, obj_type, region, "FAILED", str(error)
+
+# ---- get the list of resources (OCID, type, compartment...) matching a Resource Search query
+def search_resources(query):
+    SearchClient = oci.resource_search.ResourceSearchClient(config)
+    try:
+        response = oci.pagination.list_call_get_all_results(SearchClient.search_resources, oci.resource_search.models.StructuredSearchDetails(query=query), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    except oci.exceptions.ServiceError as error:
+        print ("ERROR 05: search query failed: {}".format(error.message))
+        exit (5)
+    return response.data
+
+# ---- get the list of OCIDs from a Resource Search query
+def search_ocids(query):
+    return [ resource.identifier for resource in search_resources(query) ]
+
+# ---- add or remove the tag key for all resources in parallel and display the results
+def bulk_edit_tag(ocids):
+    global region_names
+    region_names = get_region_names(config)
+
+    nb_ok = 0
+    nb_failed = 0
+    nb_skipped = 0
+    print ("{:8s} {:20s} {:20s} {:100s} {}".format("STATUS", "TYPE", "REGION", "OCID", "MESSAGE"))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        for obj_id, obj_type, region, status, message in executor.map(edit_tag, ocids):
+            if   status == "OK":      nb_ok += 1;      color = COLOR_GREEN
+            elif status == "SKIPPED": nb_skipped += 1; color = COLOR_YELLOW
+            else:                     nb_failed += 1;  color = COLOR_RED
+            print (color+"{:8s} {:20s} {:20s} {:100s} {}".format(status, obj_type, region, obj_id, message)+COLOR_NORMAL)
+
+    print ("")
+    if operation == "--add":
+        print ("{} resources: {} tagged, {} skipped, {} failed".format(len(ocids), nb_ok, nb_skipped, nb_failed))
+    else:
+        print ("{} resources: tag removed from {}, {} skipped, {} failed".format(len(ocids), nb_ok, nb_skipped, nb_failed))
+    if nb_failed > 0:
+        exit (6)
+
+# ---- --work_requests: get compartment and type of resources from their OCIDs using Resource Search (batches of OCIDs)
+def resolve_resources(ocids):
+    queries = []
+    for i in range(0, len(ocids), search_batch_size):
+        queries.append("query all resources where " + " || ".join([ "identifier = '{}'".format(ocid) for ocid in ocids[i:i+search_batch_size] ]))
+    resources = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        for batch in executor.map(search_resources, queries):
+            resources.extend(batch)
+    found = set([ resource.identifier for resource in resources ])
+    for ocid in ocids:
+        if ocid not in found:
+            print (COLOR_YELLOW+"SKIPPED: {} not found by Resource Search in region {}".format(ocid, config["region"])+COLOR_NORMAL)
+    return resources
+
+# ---- --work_requests: submit bulk edit tags work requests (resources grouped by compartment) and wait for their completion
+def bulk_edit_tags(resources):
+    IdentityClient = oci.identity.IdentityClient(config)
+    resources_per_compartment = {}
+    for resource in resources:
+        resources_per_compartment.setdefault(resource.compartment_id, []).append(resource)
+    if operation == "--add":
+        bulk_edit_operation = oci.identity.models.BulkEditOperationDetails(operation_type="ADD_OR_SET", defined_tags={ tag_ns: { tag_key: tag_value } })
+    else:
+        bulk_edit_operation = oci.identity.models.BulkEditOperationDetails(operation_type="REMOVE", defined_tags={ tag_ns: { tag_key: "" } })
+
+    # submit work requests
+    work_requests = {}
+    nb_failed = 0
+    for compartment_id, cpt_resources in resources_per_compartment.items():
+        for i in range(0, len(cpt_resources), bulk_edit_max_resources):
+            batch = cpt_resources[i:i+bulk_edit_max_resources]
+            details = oci.identity.models.BulkEditTagsDetails(
+                compartment_id = compartment_id,
+                resources = [ oci.identity.models.BulkEditResource(id=resource.identifier, resource_type=resource.resource_type) for resource in batch ],
+                bulk_edit_operations = [ bulk_edit_operation ])
+            try:
+                response = IdentityClient.bulk_edit_tags(bulk_edit_tags_details=details, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+                work_requests[response.headers["opc-work-request-id"]] = (compartment_id, len(batch))
+            except oci.exceptions.ServiceError as error:
+                print (COLOR_RED+"FAILED: cannot submit work request for {} resources in compartment {}: {}".format(len(batch), compartment_id, error.message)+COLOR_NORMAL)
+                nb_failed += len(batch)
+    print ("{} resources in {} compartments: {} work requests submitted".format(len(resources), len(resources_per_compartment), len(work_requests)))
+
+    # wait for completion of work requests and display progress (status TIMEOUT if not completed after wait_timeout minutes)
+    pending = list(work_requests.keys())
+    results = {}
+    deadline = time.time() + 60 * wait_timeout
+    while len(pending) > 0:
+        if time.time() > deadline:
+            for work_request_id in pending:
+                results[work_request_id] = "TIMEOUT"
+            break
+        time.sleep(poll_interval)
+        percent = 100 * (len(work_requests) - len(pending))
+        for work_request_id in pending[:]:
+            try:
+                work_request = IdentityClient.get_tagging_work_request(work_request_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
+            except oci.exceptions.ServiceError as error:
+                print (COLOR_YELLOW+"WARNING: cannot get status of work request {}: {} {}".format(work_request_id, error.status, error.message)+COLOR_NORMAL)
+                continue
+            if work_request.status in ("SUCCEEDED", "PARTIALLY_SUCCEEDED", "FAILED", "CANCELED"):
+                results[work_request_id] = work_request.status
+                pending.remove(work_request_id)
+                percent += 100
+            else:
+                percent += work_request.percent_complete or 0
+        print ("- {} / {} work requests completed ({:.0f} %)".format(len(results), len(work_requests), percent / len(work_requests)))
+
+    # display results (errors of the work request = resources not updated)
+    print ("")
+    for work_request_id, (compartment_id, nb_resources) in work_requests.items():
+        if results[work_request_id] == "SUCCEEDED":
+            print (COLOR_GREEN+"SUCCEEDED: {} resources in compartment {}".format(nb_resources, compartment_id)+COLOR_NORMAL)
+            continue
+        print (COLOR_RED+"{}: {} resources in compartment {} (work request {})".format(results[work_request_id], nb_resources, compartment_id, work_request_id)+COLOR_NORMAL)
+        try:
+            response = oci.pagination.list_call_get_all_results(IdentityClient.list_tagging_work_request_errors, work_request_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+            errors = response.data
+        except oci.exceptions.ServiceError as error:
+            errors = []
+            print (COLOR_RED+"  - cannot get errors of work request: {} {}".format(error.status, error.message)+COLOR_NORMAL)
+        for error in errors:
+            print (COLOR_RED+"  - {} {}".format(error.code, error.message)+COLOR_NORMAL)
+        if results[work_request_id] == "PARTIALLY_SUCCEEDED" and len(errors) > 0:
+            nb_failed += min(len(errors), nb_resources)
+        else:
+            nb_failed += nb_resources
+    if nb_failed > 0:
+        print ("")
+        print ("{} resources not updated or with unknown status".format(nb_failed))
+        exit (6)
+
+# ---- bulk mode options given before OCI_PROFILE and sources of OCIDs given after OCI_PROFILE
+BULK_OPTIONS = ("--threads", "--work_requests")
+BULK_SOURCES = ("--file", "--stdin", "--query")
+
+# ---- check if the arguments of OCI_object_add_tag.py or OCI_object_remove_tag.py are for the bulk mode
+def is_bulk_mode(args):
+    return (len(args) > 0 and args[0] in BULK_OPTIONS) or (len(args) > 1 and args[1] in BULK_SOURCES)
+
+# ---- bulk mode: parse arguments ([--threads N | --work_requests] OCI_PROFILE --file ocids_file|--stdin|--query search_query
+# ---- tag_namespace tag_key [tag_value]), then add (--add) or remove (--remove) the tag key for all the resources
+# ---- lusage() is called if the arguments are not valid
+# ---- also used by OCI_object_add_tag.py and OCI_object_remove_tag.py (same directory)
+def bulk_tag(loperation, args, lusage):
+    global config, operation, tag_ns, tag_key, tag_value, nb_threads, region_names
+
+    # -- parse arguments
+    operation      = loperation
+    threads_option = False
+    work_requests  = False
+    while len(args) > 0 and args[0] in BULK_OPTIONS:
+        if args[0] == "--threads":
+            if len(args) < 2 or not(args[1].isdigit()) or int(args[1]) == 0: lusage()
+            threads_option = True
+            nb_threads = int(args[1])
+            args = args[2:]
+        else:
+            work_requests = True
+            args = args[1:]
+
+    if (threads_option and work_requests) or len(args) < 2:
+        lusage()
+    bulk_source = args[1]
+    if bulk_source in ("--file", "--query") and len(args) > 2:
+        bulk_arg = args[2]
+        args = [ args[0] ] + args[3:]
+    elif bulk_source == "--stdin":
+        args = [ args[0] ] + args[2:]
+    else:
+        lusage()
+    if len(args) != (4 if operation == "--add" else 3):
+        lusage()
+
+    profile  = args[0]
+    tag_ns   = args[1]
+    tag_key  = args[2]
+    tag_value= args[3] if operation == "--add" else None
+
+    # -- load profile from config file
+    try:
+        config = oci.config.from_file(configfile,profile)
+
+    except:
+        print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
+        exit (2)
+
+    region_names = {}
+
+    # -- get the list of OCIDs or resources
+    if bulk_source == "--stdin":
+        ocids = read_ocids(sys.stdin)
+    elif bulk_source == "--file":
+        try:
+            with open(bulk_arg, "r") as f:
+                ocids = read_ocids(f)
+        except OSError:
+            print ("ERROR 04: cannot read file {} !".format(bulk_arg))
+            exit (4)
+    elif work_requests:
+        ocids = None
+        resources = search_resources(bulk_arg)
+    else:
+        ocids = search_ocids(bulk_arg)
+
+    # -- add or remove the tag key
+    if work_requests:
+        if ocids != None:
+            resources = resolve_resources(ocids)
+        bulk_edit_tags(resources)
+    else:
+        bulk_edit_tag(ocids)
+
+# ------------ main
+
+if __name__ == "__main__":
+
+    # -- --add or --remove can be given before or after the other options
+    args = sys.argv[1:]
+    operation = None
+    options   = []
+    while len(args) > 0 and args[0] in BULK_OPTIONS + ("--add", "--remove"):
+        if args[0] in ("--add", "--remove"):
+            if operation != None: usage()
+            operation = args[0]
+            args = args[1:]
+        elif args[0] == "--threads" and len(args) > 1:
+            options += args[:2]
+            args = args[2:]
+        else:
+            options += args[:1]
+            args = args[1:]
+    if operation == None:
+        usage()
+
+    bulk_tag(operation, options + args, usage)
+
+    # -- the end
+    exit (0)
@@ -12,11 +12,16 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-04-24: Initial Version
+#    2026-10-19: Get all pages of results, add -a option to search in all subscribed regions in parallel
+#    2026-10-19: Add --where option to search with an expression (AND/OR/NOT, exists, !=, resource type, lifecycle state)
+#    2026-10-19: Reject single quotes in tag names and values (they would end the quoted values of the query)
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
+import re
 import sys
+import concurrent.futures
 
 # ---------- Functions
 
@@ -25,10 +30,26 @@ configfile = "~/.oci/config"    # Define config file to be used.
 
 # ---- usage syntax
 def usage():
-    print ("Usage: {} OCI_PROFILE tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("Usage: {} [-a] OCI_PROFILE tag_namespace tag_key tag_value".format(sys.argv[0]))
+    print ("    or {} [-a] OCI_PROFILE --where expression".format(sys.argv[0]))
+    print ("    or {} --show_query expression".format(sys.argv[0]))
     print ("")
-    print ("")
-    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("Notes: ")
+    print ("- If -a is provided, the search is done in all subscribed regions in parallel and the results are")
+    print ("  grouped by resource type and compartment path, otherwise the search is done in the region of the profile")
+    print ("- expression is made of conditions combined with AND, OR, NOT and parenthesis. Conditions are:")
+    print ("    namespace.key = value       : defined tag present with this value")
+    print ("    namespace.key != value      : defined tag present with another value")
+    print ("    namespace.key exists        : defined tag present (any value)")
+    print ("    type = instance,volume      : resource type (or type != ...)")
+    print ("    state = RUNNING             : lifecycle state (or state != ...)")
+    print ("  Values containing spaces must be quoted (single quotes are not supported in values), for example:")
+    print ("    \"ops.env exists AND ops.env != prod AND NOT ops.owner exists AND type = instance\"")
+    print ("- The expression is converted into a Resource Search query so that filtering is done by OCI.")
+    print ("  Conditions that cannot be expressed in the query syntax (ex: missing tag) are checked on the results")
+    print ("  Tag values are compared without case sensitivity, like Resource Search does")
+    print ("  --show_query displays the generated query (which can be used with OCI_object_add_tag.py --query)")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
     print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
@@ -40,22 +61,230 @@ def usage():
 
 # -- Get the name of a compartment from its id
 def get_cpt_name_from_id(cpt_id):
-    for c in compartments:
-        if (c.id == cpt_id):
-            return c.name
+    if cpt_id in compartments:
+        return compartments[cpt_id].name
     return "root"
 
+# -- Get the full path of a compartment from its id (ex: /cpt1/cpt2), paths are cached
+def get_cpt_path_from_id(cpt_id):
+    if cpt_id not in cpt_paths:
+        if cpt_id in compartments:
+            cpt_paths[cpt_id] = get_cpt_path_from_id(compartments[cpt_id].compartment_id) + "/" + compartments[cpt_id].name
+        else:
+            cpt_paths[cpt_id] = ""
+    return cpt_paths[cpt_id]
+
+# -- Split an expression into tokens: parenthesis, operators, words and quoted values
+def tokenize(expression):
+    tokens = re.findall(r"\(|\)|!=|=|'[^']*'|\"[^\"]*\"|[^\s()=!]+", expression)
+    if re.sub(r"[\s'\"]", "", "".join(tokens)) != re.sub(r"[\s'\"]", "", expression):
+        syntax_error("invalid character")
+    return tokens
+
+def syntax_error(message):
+    print ("ERROR 03: syntax error in expression: {} !".format(message))
+    exit (3)
+
+# -- Names and values are put between single quotes in the Resource Search query, so they cannot contain any
+def check_no_single_quote(value):
+    if "'" in value:
+        print ("ERROR 04: single quotes are not supported in names and values: \"{}\" !".format(value))
+        exit (4)
+
+# -- Parse an expression and return a tree made of tuples:
+# -- ("or", [nodes]), ("and", [nodes]), ("not", node), ("tag", namespace, key, operator, value), ("type", operator, [types]), ("state", operator, state)
+# -- grammar: expr = term (OR term)* / term = factor (AND factor)* / factor = NOT factor | ( expr ) | condition
+def parse_expression(expression):
+    tokens = tokenize(expression)
+    node, pos = parse_or(tokens, 0)
+    if pos != len(tokens):
+        syntax_error("unexpected '{}'".format(tokens[pos]))
+    return node
+
+def parse_or(tokens, pos):
+    nodes = []
+    node, pos = parse_and(tokens, pos)
+    nodes.append(node)
+    while pos < len(tokens) and tokens[pos].upper() == "OR":
+        node, pos = parse_and(tokens, pos + 1)
+        nodes.append(node)
+    return (nodes[0] if len(nodes) == 1 else ("or", nodes)), pos
+
+def parse_and(tokens, pos):
+    nodes = []
+    node, pos = parse_factor(tokens, pos)
+    nodes.append(node)
+    while pos < len(tokens) and tokens[pos].upper() == "AND":
+        node, pos = parse_factor(tokens, pos + 1)
+        nodes.append(node)
+    return (nodes[0] if len(nodes) == 1 else ("and", nodes)), pos
+
+def parse_factor(tokens, pos):
+    if pos >= len(tokens):
+        syntax_error("unexpected end of expression")
+    if tokens[pos].upper() == "NOT":
+        node, pos = parse_factor(tokens, pos + 1)
+        return ("not", node), pos
+    if tokens[pos] == "(":
+        node, pos = parse_or(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] != ")":
+            syntax_error("missing )")
+        return node, pos + 1
+    return parse_condition(tokens, pos)
+
+def parse_condition(tokens, pos):
+    name = tokens[pos]
+    check_no_single_quote(name)
+    if pos + 1 < len(tokens) and tokens[pos + 1].lower() == "exists":
+        if "." not in name:
+            syntax_error("'exists' needs namespace.key, not '{}'".format(name))
+        namespace, key = name.split(".", 1)
+        return ("tag", namespace, key, "exists", None), pos + 2
+    if pos + 2 >= len(tokens) or tokens[pos + 1] not in ("=", "!="):
+        syntax_error("condition expected after '{}'".format(name))
+    operator = tokens[pos + 1]
+    value = tokens[pos + 2].strip("'\"")
+    check_no_single_quote(value)
+    if name.lower() == "type":
+        return ("type", operator, [ t.strip().lower() for t in value.split(",") ]), pos + 3
+    if name.lower() == "state":
+        return ("state", operator, value), pos + 3
+    if "." not in name:
+        syntax_error("unknown field '{}' (use type, state or namespace.key)".format(name))
+    namespace, key = name.split(".", 1)
+    return ("tag", namespace, key, operator, value), pos + 3
+
+# -- Convert an expression tree into a Resource Search condition (negations are pushed down to the conditions)
+# -- return None for conditions that cannot be expressed in the query syntax (they are checked on the results)
+def build_condition(node, negated=False):
+    if node[0] == "not":
+        return build_condition(node[1], not negated)
+    if node[0] in ("and", "or"):
+        conditions = [ build_condition(child, negated) for child in node[1] ]
+        if (node[0] == "and") != negated:       # AND, or NOT(OR) = AND of negated conditions
+            conditions = [ c for c in conditions if c != None ]
+            if len(conditions) == 0:
+                return None
+            return "(" + " && ".join(conditions) + ")" if len(conditions) > 1 else conditions[0]
+        else:                                   # OR, or NOT(AND) = OR of negated conditions
+            if None in conditions:
+                return None
+            return "(" + " || ".join(conditions) + ")"
+    if node[0] == "state":
+        operator = node[1] if not negated else ("!=" if node[1] == "=" else "=")
+        return "lifecycleState {} '{}'".format(operator, node[2])
+    if node[0] == "tag" and not negated:
+        condition = "definedTags.namespace = '{}' && definedTags.key = '{}'".format(node[1], node[2])
+        if node[3] != "exists":
+            condition += " && definedTags.value {} '{}'".format(node[3], node[4])
+        return "(" + condition + ")"
+    return None     # negated tag conditions (missing tag) and resource types
+
+# -- Build the Resource Search query from an expression tree
+# -- resource types given at the top level of the expression are put in the query (query instance, volume resources ...)
+def build_query(node):
+    resource_types = "all"
+    top_level = node[1] if node[0] == "and" else [ node ]
+    for child in top_level:
+        if child[0] == "type" and child[1] == "=":
+            resource_types = ", ".join(child[2])
+            break
+    condition = build_condition(node)
+    if condition == None:
+        return "query {} resources".format(resource_types)
+    return "query {} resources where {}".format(resource_types, condition)
+
+# -- Check if a resource matches an expression tree
+def match_expression(node, item):
+    if node[0] == "and": return all([ match_expression(child, item) for child in node[1] ])
+    if node[0] == "or":  return any([ match_expression(child, item) for child in node[1] ])
+    if node[0] == "not": return not match_expression(node[1], item)
+    if node[0] == "tag":
+        tags = (item.defined_tags or {}).get(node[1], {})
+        if node[3] == "exists": return node[2] in tags
+        if node[3] == "!=":     return node[2] in tags and str(tags[node[2]]).lower() != node[4].lower()
+        return node[2] in tags and str(tags[node[2]]).lower() == node[4].lower()
+    if node[0] == "type":
+        result = item.resource_type.lower() in node[2]
+    else:
+        result = (item.lifecycle_state or "").lower() == node[2].lower()
+    return result if node[1] == "=" else not result
+
+# -- Get all the resources matching the query in a region (all pages)
+def search_resources(region):
+    SearchClient = oci.resource_search.ResourceSearchClient(dict(config, region=region))
+    response = oci.pagination.list_call_get_all_results(SearchClient.search_resources, oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    if where_expr != None:
+        return [ item for item in response.data if match_expression(where_expr, item) ]
+    return response.data
+
+# -- Search in all subscribed regions in parallel and display results grouped by resource type and compartment
+def search_all_regions():
+    response = IdentityClient.list_region_subscriptions(RootCompartmentID)
+    regions = [ region.region_name for region in response.data ]
+
+    results = {}    # resource type -> compartment path -> list of (region, item)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(regions)) as executor:
+        futures = { executor.submit(search_resources, region): region for region in regions }
+        for future in concurrent.futures.as_completed(futures):
+            region = futures[future]
+            try:
+                items = future.result()
+            except oci.exceptions.ServiceError as error:
+                print ("WARNING: search failed in region {}: {}".format(region, error.message))
+                continue
+            for item in items:
+                results.setdefault(item.resource_type, {}).setdefault(get_cpt_path_from_id(item.compartment_id) or "/", []).append((region, item))
+
+    nb_resources = 0
+    for resource_type in sorted(results):
+        nb = sum([ len(items) for items in results[resource_type].values() ])
+        nb_resources += nb
+        print ("==== {} ({})".format(resource_type, nb))
+        for cpt_path in sorted(results[resource_type]):
+            print ("  {}".format(cpt_path))
+            for region, item in sorted(results[resource_type][cpt_path], key=lambda result: (result[0], result[1].display_name)):
+                print ("    {:20s} {:50s} {}".format(region, item.display_name, item.identifier))
+    print ("")
+    print ("{} resources found in {} regions".format(nb_resources, len(regions)))
+
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) == 5:
-    profile  = sys.argv[1]
-    tag_ns   = sys.argv[2]
-    tag_key  = sys.argv[3]
-    tag_value= sys.argv[4]
+all_regions = False
+args = sys.argv[1:]
+if len(args) > 0 and args[0] == "-a":
+    all_regions = True
+    args = args[1:]
+
+where = None
+if len(args) == 2 and args[0] == "--show_query" and not(all_regions):
+    where = args[1]
+elif len(args) == 3 and args[1] == "--where":
+    profile  = args[0]
+    where    = args[2]
+elif len(args) == 4:
+    profile  = args[0]
+    tag_ns   = args[1]
+    tag_key  = args[2]
+    tag_value= args[3]
+    for value in (tag_ns, tag_key, tag_value):
+        check_no_single_quote(value)
 else:
     usage()
 
+# -- Query (see https://docs.cloud.oracle.com/en-us/iaas/Content/Search/Concepts/querysyntax.htm)
+if where != None:
+    where_expr = parse_expression(where)
+    query = build_query(where_expr)
+else:
+    where_expr = None
+    query = "query all resources where (definedTags.namespace = '{:s}' && definedTags.key = '{:s}' && definedTags.value = '{:s}')".format(tag_ns, tag_key, tag_value)
+
+if args[0] == "--show_query":
+    print (query)
+    exit (0)
+
 # -- load profile from config file
 try:
     config = oci.config.from_file(configfile,profile)
@@ -67,21 +296,21 @@ IdentityClient = oci.identity.IdentityClient(config)
 user = IdentityClient.get_user(config["user"]).data
 RootCompartmentID = user.compartment_id
 
-# -- Query (see https://docs.cloud.oracle.com/en-us/iaas/Content/Search/Concepts/querysyntax.htm)
-query = "query all resources where (definedTags.namespace = '{:s}' && definedTags.key = '{:s}' && definedTags.value = '{:s}')".format(tag_ns, tag_key, tag_value)
-
 # -- Get list of compartments with all sub-compartments
 response = oci.pagination.list_call_get_all_results(IdentityClient.list_compartments,RootCompartmentID,compartment_id_in_subtree=True)
-compartments = response.data
+compartments = { c.id: c for c in response.data }
+cpt_paths = {}
 
-# -- Get the resources
-SearchClient = oci.resource_search.ResourceSearchClient(config)
+# -- Get the resources in all regions
+if all_regions:
+    search_all_regions()
+    exit (0)
 
-#response = oci.pagination.list_call_get_all_results(SearchClient.search_resources, oci.resource_search.models.StructuredSearchDetails(query))
-response = SearchClient.search_resources(oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query))
-if len(response.data.items) > 0:
+# -- Get the resources
+items = search_resources(config["region"])
+if len(items) > 0:
     print ("Resource Type, Compartment, Display Name, OCID")
-for item in response.data.items:
+for item in items:
     cpt_name = get_cpt_name_from_id(item.compartment_id)
     print ("{:s}, {:s}, {:s}, {:s}".format(item.resource_type, cpt_name, item.display_name, item.identifier))
 
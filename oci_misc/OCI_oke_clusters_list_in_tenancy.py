@@ -15,11 +15,14 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2021-01-11: Initial Version
+#    2026-10-19: Reuse SDK clients (one client per service and region) instead of creating one client per call
+#    2026-10-19: Client pool shared in oci_misc/oci_scripts_common.py, only used for the clients created in loops
 # ---------------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
 import sys
+from oci_scripts_common import get_client
 
 # ---------- Functions
 
@@ -68,7 +71,7 @@ def process_compartment (lcpt_id):
     region  = config["region"]
 
     # look for OKE clusters
-    ContainerEngineClient = oci.container_engine.ContainerEngineClient(config)
+    ContainerEngineClient = get_client(oci.container_engine.ContainerEngineClient, config)
     response = oci.pagination.list_call_get_all_results(ContainerEngineClient.list_clusters,compartment_id=lcpt_id)
     if len(response.data) > 0:
         for cluster in response.data:
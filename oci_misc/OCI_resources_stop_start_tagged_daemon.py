@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+
+# ---------------------------------------------------------------------------------------------------------------------------------
+# This script runs as a daemon (long running process) and stops (or starts) compute instances, autonomous databases
+#     and VM database systems with a specific tag key when the tag value matches the current UTC time.
+# It replaces hourly executions of the *_stop_start_tagged.py scripts by an external scheduler (cron table):
+# - configuration, authentication, list of regions are only loaded once
+# - tagged resources are kept in memory (inventory) and refreshed periodically using 1 Resource Search query per region:
+#   only new, modified or deleted resources are updated
+# - the schedules (tag values) of each resource are compiled once in an index (time zone, weekday, hour) -> resources,
+#   so the daemon sleeps until the next hour boundary having events and only processes the resources of this slot
+# - the actions submitted are tracked in the background (lifecycle states polled until the expected state is reached)
+#   and a summary of the actions of each tick is displayed
+# - tag values can contain several hours, weekdays, hour ranges and a time zone (see usage), for instance
+#   "mon-fri 08:00 Europe/Paris" or "mon-fri 7,19; sat 10:00", and the format of the *_stop_start_tagged.py scripts
+#   (ex: "10:00_UTC") is still supported
+#
+# This script looks in all compartments in a OCI tenant in a region (or all subscribed regions) using OCI Python SDK
+# Note: OCI tenant and region given by an OCI CLI PROFILE
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+#                 - OCI config file configured with profiles
+#                 - OCI user with enough privileges to be able to read, stop and start resources (policy example below)
+#                       allow group osc_stop_and_start to read instances in tenancy
+#                       allow group osc_stop_and_start to manage instances in tenancy where request.operation = 'InstanceAction'
+#                       allow group osc_stop_and_start to use autonomous-databases in tenancy
+#                       allow group osc_stop_and_start to read db-systems in tenancy
+#                       allow group osc_stop_and_start to use db-nodes in tenancy
+# Versions
+#    2026-10-19: Initial Version
+#    2026-10-19: Schedule expressions (hours, weekdays, ranges, time zones) compiled in a (time zone, weekday, hour) index
+#    2026-10-19: Track the stop/start actions of each tick until the resources reach the expected state (summary in the log)
+#    2026-10-19: Process due ticks before refreshing the inventory, lateness measured from wake-up time, log event errors
+#    2026-10-19: Tracker of actions and pool of clients shared in oci_scripts_common.py (any request error is FAILED)
+# ---------------------------------------------------------------------------------------------------------------------------------
+
+# -- import
+import oci
+import sys
+import os
+import re
+import time
+import signal
+import functools
+import threading
+import concurrent.futures
+from datetime import datetime, timezone
+from oci_scripts_common import get_client, ActionsTracker
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None             # Python < 3.9: only UTC schedules are supported
+
+# ---------- Tag names, key and value to look for
+# Resources tagged using this will be stopped/started.
+# Update these to match your tags.
+tag_ns        = "osc"
+tag_key_stop  = "automatic_shutdown"
+tag_key_start = "automatic_startup"
+
+# ---------- Colors for output
+COLOR_YELLOW="\033[93m"
+COLOR_RED="\033[91m"
+COLOR_NORMAL="\033[39m"
+
+# ---------- variables
+configfile        = "~/.oci/config"    # Define config file to be used.
+refresh_interval  = 15                 # Nb of minutes between 2 refreshes of the inventory (change it with --refresh)
+max_delay         = 300                # Nb of seconds after which a late event is ignored (ex: after a suspend of the host)
+nb_threads        = 10                 # Nb of resources processed in parallel when several events occur at the same time
+tick_duration     = 900                # Nb of seconds between 2 possible events (15 minutes for time zones like Asia/Kolkata)
+wait_timeout      = 30                 # Max nb of minutes to wait for the completion of the actions
+FAILED_STATES     = [ "FAILED", "UNAVAILABLE", "TERMINATING", "TERMINATED" ]    # Lifecycle states of a failed action
+
+# ---- supported resource types: Resource Search type -> (service client, description)
+RESOURCE_TYPES = {
+    "Instance":           (oci.core.ComputeClient,          "instance"),
+    "AutonomousDatabase": (oci.database.DatabaseClient,     "autonomous db"),
+    "DbSystem":           (oci.database.DatabaseClient,     "DB system")
+}
+
+# ---------- Functions
+
+# ---- usage syntax
+def usage():
+    print ("Usage: {} [-a] [--confirm_stop] [--confirm_start] [--refresh minutes] OCI_PROFILE".format(sys.argv[0]))
+    print ("")
+    print ("Notes:")
+    print ("    If -a is provided, the script processes all active regions instead of singe region provided in profile")
+    print ("    If --confirm_stop  is not provided, the resources to stop are listed but not actually stopped")
+    print ("    If --confirm_start is not provided, the resources to start are listed but not actually started")
+    print ("    The list of tagged resources is refreshed every {} minutes (change it with --refresh)".format(refresh_interval))
+    print ("    The script runs until it is stopped (CTRL-C or SIGTERM): do not schedule it in a cron table")
+    print ("")
+    print ("Syntax of tag values: one or more schedules separated by ';', each schedule being '[days] hours [time_zone]'")
+    print ("    days     : mon, mon-fri, sat,sun, mon,wed-fri ... (default: every day)")
+    print ("    hours    : 10:00, 8,12,18, 8-18 (every hour), 8-18/2 (every 2 hours) ... (whole hours only)")
+    print ("    time_zone: UTC (default) or a time zone name like Europe/Paris")
+    print ("    examples : '10:00_UTC', 'mon-fri 08:00 Europe/Paris', 'mon-fri 7,19; sat 10:00', 'off'")
+    print ("")
+    print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("")
+    print ("[EMEAOSCf]")
+    print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("user        = ocid1.user.oc1..aaaaaaaayblfepjieoxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("fingerprint = 19:1d:7b:3a:17:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx")
+    print ("key_file    = /Users/cpauliat/.oci/api_key.pem")
+    print ("region      = eu-frankfurt-1")
+    exit (1)
+
+# ---- display a message with date and time
+def log(message):
+    print ("{:s}: {:s}".format(datetime.utcnow().strftime("%Y/%m/%d %T"), message))
+
+# ---- get the tag values (stop, start) of a resource
+def get_tag_values(defined_tags):
+    try:
+        tags = defined_tags[tag_ns]
+    except:
+        return "none", "none"
+    return tags.get(tag_key_stop, "none"), tags.get(tag_key_start, "none")
+
+# ---- get the weekdays of the days field of a schedule (ex: mon-fri, sat,sun, fri-mon, *)
+DAYS = [ "mon", "tue", "wed", "thu", "fri", "sat", "sun" ]
+
+def parse_days(field):
+    days = set()
+    for item in field.lower().split(","):
+        if item == "*":
+            days.update(range(7))
+            continue
+        bounds = item.split("-")
+        if len(bounds) > 2 or any([ bound not in DAYS for bound in bounds ]):
+            raise ValueError("invalid day '{}'".format(item))
+        first, last = DAYS.index(bounds[0]), DAYS.index(bounds[-1])
+        days.update([ (first + i) % 7 for i in range((last - first) % 7 + 1) ])
+    return days
+
+# ---- get the hours of the hours field of a schedule (ex: 10:00, 8,12,18, 8-18, 8-18/2, 22-2)
+def parse_hours(field):
+    hours = set()
+    for item in field.split(","):
+        match = re.match(r"^(\d{1,2})(?::00)?(?:-(\d{1,2})(?::00)?(?:/(\d{1,2}))?)?$", item)
+        if not(match):
+            raise ValueError("invalid hour '{}' (whole hours only)".format(item))
+        first = int(match.group(1))
+        last  = int(match.group(2)) if match.group(2) else first
+        step  = int(match.group(3)) if match.group(3) else 1
+        if first > 23 or last > 23 or step == 0:
+            raise ValueError("invalid hour '{}'".format(item))
+        hours.update([ (first + i) % 24 for i in range(0, (last - first) % 24 + 1, step) ])
+    return hours
+
+# ---- get the time zone of the time zone field of a schedule (UTC or name like Europe/Paris)
+def get_zone(name):
+    if name not in zones:
+        if name == "UTC":
+            zones[name] = timezone.utc
+        elif ZoneInfo == None:
+            raise ValueError("time zone '{}' not supported (Python 3.9+ needed)".format(name))
+        else:
+            try:
+                zones[name] = ZoneInfo(name)
+            except Exception:
+                raise ValueError("unknown time zone '{}'".format(name))
+    return zones[name]
+
+# ---- compile a tag value (schedule expression) into the set of slots (time zone, weekday, hour) where the event occurs
+# ---- tag values are compiled once (cache) as many resources usually share the same tag values
+# ---- raise ValueError for an invalid tag value
+@functools.lru_cache(maxsize=None)
+def compile_schedule(tag_value):
+    result = set()
+    value  = re.sub(r"_UTC\b", " UTC", tag_value.strip())      # format of the *_stop_start_tagged.py scripts: 10:00_UTC
+    if value.lower() in ("", "off", "none"):
+        return frozenset()
+    for schedule in value.split(";"):
+        days, hours, zone = None, None, None
+        for field in schedule.split():
+            if field[0].isdigit():
+                if hours != None: raise ValueError("several hours fields in '{}'".format(schedule.strip()))
+                hours = parse_hours(field)
+            elif field.upper() == "UTC" or "/" in field:
+                if zone != None: raise ValueError("several time zones in '{}'".format(schedule.strip()))
+                zone = "UTC" if field.upper() == "UTC" else field
+            else:
+                if days != None: raise ValueError("several days fields in '{}'".format(schedule.strip()))
+                days = parse_days(field)
+        if hours == None:
+            raise ValueError("no hour in '{}'".format(schedule.strip()))
+        zone = zone or "UTC"
+        get_zone(zone)
+        result.update([ (zone, day, hour) for day in (days if days != None else range(7)) for hour in hours ])
+    return frozenset(result)
+
+# ---- update the index with the schedule of a resource for an action (stop or start)
+def index_schedule(ocid, action, tag_value):
+    for slot in slots.pop((ocid, action), []):
+        index[slot].discard((ocid, action))
+        if len(index[slot]) == 0: del index[slot]
+    try:
+        new_slots = compile_schedule(tag_value)
+    except ValueError as error:
+        log (COLOR_YELLOW+"WARNING: {} tag of {} ignored: invalid value '{}': {}".format(action, inventory[ocid]["name"], tag_value, error)+COLOR_NORMAL)
+        return
+    if len(new_slots) > 0:
+        slots[(ocid, action)] = new_slots
+    for slot in new_slots:
+        index.setdefault(slot, set()).add((ocid, action))
+
+# ---- get the events (OCID, action) of a tick (epoch): for each time zone used, only the slot of the tick is read
+def get_tick_events(tick):
+    due = set()
+    for name, zone in zones.items():
+        local_time = datetime.fromtimestamp(tick, zone)
+        if local_time.minute == 0:
+            due.update(index.get((name, local_time.weekday(), local_time.hour), []))
+    return due
+
+# ---- find tagged resources in a region using a Resource Search query (return None if the query fails)
+def search_tagged_resources(region):
+    query  = "query instance, autonomousdatabase, dbsystem resources where "
+    query += "(definedTags.namespace = '{0}' && definedTags.key = '{1}') || (definedTags.namespace = '{0}' && definedTags.key = '{2}')".format(tag_ns, tag_key_stop, tag_key_start)
+    SearchClient = get_client(oci.resource_search.ResourceSearchClient, dict(config, region=region))
+    try:
+        response = oci.pagination.list_call_get_all_results(SearchClient.search_resources, oci.resource_search.models.StructuredSearchDetails(type="Structured", query=query), retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    except Exception as error:
+        log (COLOR_RED+"WARNING: search failed in region {}: {}".format(region, error)+COLOR_NORMAL)
+        return None
+    return response.data
+
+# ---- refresh the inventory of tagged resources and the index of new, modified or deleted resources
+def refresh_inventory():
+    global compartments
+    IdentityClient = get_client(oci.identity.IdentityClient, config)
+    try:
+        response = oci.pagination.list_call_get_all_results(IdentityClient.list_compartments, RootCompartmentID, compartment_id_in_subtree=True)
+        compartments = { cpt.id: cpt.name for cpt in response.data }
+        compartments[RootCompartmentID] = "root"
+    except Exception as error:
+        log (COLOR_RED+"WARNING: cannot list compartments: {}".format(error)+COLOR_NORMAL)
+
+    found = {}
+    for region in regions:
+        items = search_tagged_resources(region)
+        if items == None:
+            # keep the resources of this region as they are until the next refresh
+            found.update({ ocid: resource for ocid, resource in inventory.items() if resource["region"] == region })
+            continue
+        for item in items:
+            if item.resource_type not in RESOURCE_TYPES or item.lifecycle_state in ("TERMINATED", "TERMINATING"): continue
+            tag_value_stop, tag_value_start = get_tag_values(item.defined_tags)
+            found[item.identifier] = { "type": item.resource_type, "name": item.display_name, "region": region,
+                                       "compartment_id": item.compartment_id, "stop": tag_value_stop, "start": tag_value_start }
+
+    nb_new, nb_modified, nb_deleted = 0, 0, 0
+    for ocid in list(inventory):
+        if ocid not in found:
+            index_schedule(ocid, "stop", "none")
+            index_schedule(ocid, "start", "none")
+            del inventory[ocid]
+            nb_deleted += 1
+    for ocid, resource in found.items():
+        old = inventory.get(ocid)
+        inventory[ocid] = resource
+        if old == None: nb_new += 1
+        elif old != resource: nb_modified += 1
+        for action in ("stop", "start"):
+            if old == None or old[action] != resource[action]:
+                index_schedule(ocid, action, resource[action])
+
+    log ("Inventory refreshed: {} tagged resources ({} new, {} modified, {} deleted), {} schedule slots".format(len(inventory), nb_new, nb_modified, nb_deleted, len(index)))
+
+# ---- stop or start a resource if its current state and tags still match the event
+def process_event(ocid, action, tag_value, tracker):
+    resource  = inventory[ocid]
+    region    = resource["region"]
+    cpt_name  = compartments.get(resource["compartment_id"], resource["compartment_id"])
+    client_class, description = RESOURCE_TYPES[resource["type"]]
+    client    = get_client(client_class, dict(config, region=region))
+    prefix    = "{:s}, {:s}, {:s}: ".format(datetime.utcnow().strftime("%T"), region, cpt_name)
+    confirmed = confirm_stop if action == "stop" else confirm_start
+
+    # get current state and tags of the resource (the inventory may be up to refresh_interval minutes old)
+    try:
+        if resource["type"] == "Instance":
+            obj = client.get_instance(ocid, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
+            state = obj.lifecycle_state
+            expected_state, target = ("RUNNING", "SOFTSTOP") if action == "stop" else ("STOPPED", "START")
+        elif resource["type"] == "AutonomousDatabase":
+            obj = client.get_autonomous_database(ocid, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
+            state = obj.lifecycle_state
+            expected_state = "AVAILABLE" if action == "stop" else "STOPPED"
+        else:
+            obj = client.get_db_system(ocid, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
+            # process VM DB system only if available (DBS is AVAILABLE even if DB nodes are stopped)
+            if obj.lifecycle_state != "AVAILABLE": return
+            dbnode = client.list_db_nodes(compartment_id=obj.compartment_id, db_system_id=ocid, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data[0]
+            state = dbnode.lifecycle_state
+            expected_state, target = ("AVAILABLE", "STOP") if action == "stop" else ("STOPPED", "START")
+    except Exception as error:
+        print (prefix+COLOR_RED+"ERROR: cannot get {:s} {:s} ({:s}): {}".format(description, resource["name"], ocid, error)+COLOR_NORMAL)
+        return
+
+    tag_value_stop, tag_value_start = get_tag_values(obj.defined_tags)
+    if (tag_value_stop if action == "stop" else tag_value_start) != tag_value:
+        return
+    if state != expected_state:
+        return
+
+    if not(confirmed):
+        print (prefix+"{:s} {:s} ({:s}) SHOULD BE {:s} --> re-run script with --confirm_{:s} to actually {:s} resources".format(description.capitalize(), obj.display_name, ocid, "STOPPED" if action == "stop" else "STARTED", action, action))
+        return
+    # record the action for the tracker (for DB systems, the lifecycle state of the DB node is polled)
+    target_state = "STOPPED" if action == "stop" else ("RUNNING" if resource["type"] == "Instance" else "AVAILABLE")
+    record = { "id": ocid if resource["type"] != "DbSystem" else dbnode.id, "type": resource["type"] if resource["type"] != "DbSystem" else "DbNode",
+               "name": obj.display_name, "description": description, "region": region, "target": target_state }
+    if resource["type"] == "Instance":
+        tracker.submit(record, client.instance_action, ocid, target)
+    elif resource["type"] == "AutonomousDatabase":
+        tracker.submit(record, client.stop_autonomous_database if action == "stop" else client.start_autonomous_database, ocid)
+    else:
+        tracker.submit(record, client.db_node_action, dbnode.id, target)
+    if record["status"] == "FAILED":
+        print (prefix+COLOR_RED+"ERROR: cannot {:s} {:s} {:s} ({:s}): {}".format(action, description, obj.display_name, ocid, record["message"])+COLOR_NORMAL)
+    else:
+        print (prefix+"{:s} {:s} {:s} ({:s})".format("STOPPING" if action == "stop" else "STARTING", description, obj.display_name, ocid))
+
+# ---- get the current lifecycle state of the resource of an action (tracker of actions)
+def get_action_state(record):
+    client = get_client(oci.core.ComputeClient if record["type"] == "Instance" else oci.database.DatabaseClient, dict(config, region=record["region"]))
+    if   record["type"] == "Instance":           return client.get_instance(record["id"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.lifecycle_state
+    elif record["type"] == "AutonomousDatabase": return client.get_autonomous_database(record["id"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.lifecycle_state
+    else:                                        return client.get_db_node(record["id"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.lifecycle_state
+
+# ---- background thread: wait for the completion of the actions of a tick, then display a summary
+def track_actions(tracker, tick_name):
+    tracker.wait(wait_timeout)
+    counts = tracker.counts()
+    color  = COLOR_RED if counts["FAILED"] + counts["TIMEOUT"] > 0 else ""
+    log (color+"Actions of {}: {} submitted, {} succeeded, {} failed, {} timed out".format(tick_name, len(tracker.actions), counts["SUCCEEDED"], counts["FAILED"], counts["TIMEOUT"])+(COLOR_NORMAL if color else ""))
+    tracker.display_failures(COLOR_RED, COLOR_NORMAL)
+
+# ---- process the events of a tick (if it is not too late: lateness is measured from the wake-up time of the daemon,
+# ---- so that ticks reached while the daemon is busy, for instance refreshing the inventory, are not ignored)
+def process_tick(tick, awake):
+    due = get_tick_events(tick)
+    if len(due) == 0:
+        return
+    if awake - tick > max_delay:
+        log (COLOR_YELLOW+"WARNING: {} events of {} ignored (late by {:.0f} seconds)".format(len(due), datetime.utcfromtimestamp(tick).strftime("%T"), awake - tick)+COLOR_NORMAL)
+        return
+    log ("Processing {} events".format(len(due)))
+    tracker = ActionsTracker(get_action_state, FAILED_STATES)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        futures = { executor.submit(process_event, ocid, action, inventory[ocid][action], tracker): (ocid, action) for ocid, action in due }
+    for future, (ocid, action) in futures.items():
+        if future.exception() != None:
+            log (COLOR_RED+"ERROR: cannot process {} event of {} ({}): {}".format(action, inventory[ocid]["name"], ocid, repr(future.exception()))+COLOR_NORMAL)
+    if len(tracker.actions) > 0:
+        threading.Thread(target=track_actions, args=(tracker, datetime.utcfromtimestamp(tick).strftime("%H:%M_UTC")), daemon=True).start()
+
+# ---- stop the daemon on SIGTERM like on CTRL-C
+def sigterm_handler(signum, frame):
+    raise KeyboardInterrupt
+
+# ------------ main
+
+# -- parse arguments
+all_regions   = False
+confirm_stop  = False
+confirm_start = False
+
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("-"):
+    if   args[0] == "-a":              all_regions   = True
+    elif args[0] == "--confirm_stop":  confirm_stop  = True
+    elif args[0] == "--confirm_start": confirm_start = True
+    elif args[0] == "--refresh" and len(args) > 1 and args[1].isdigit() and int(args[1]) > 0:
+        refresh_interval = int(args[1])
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if len(args) != 1: usage()
+profile = args[0]
+
+# -- starting (outputs are flushed at each line as they are usually redirected to a log file)
+sys.stdout.reconfigure(line_buffering=True)
+pid=os.getpid()
+log ("BEGIN SCRIPT PID={:d}".format(pid))
+
+# -- load profile from config file
+try:
+    config = oci.config.from_file(configfile,profile)
+
+except:
+    print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
+    exit (2)
+
+RootCompartmentID = config["tenancy"]
+
+# -- get list of regions to process
+if all_regions:
+    response = oci.pagination.list_call_get_all_results(get_client(oci.identity.IdentityClient, config).list_region_subscriptions, RootCompartmentID)
+    regions  = [ region.region_name for region in response.data if region.status == "READY" ]
+else:
+    regions  = [ config["region"] ]
+
+# -- inventory of tagged resources (OCID -> resource) and index of schedules
+inventory    = {}
+compartments = {}
+index        = {}       # slot (time zone, weekday, hour) -> set of (OCID, action)
+slots        = {}       # (OCID, action) -> slots of the schedule of this resource and action
+zones        = {}       # time zone name -> time zone used by schedules
+
+# -- do the job until the daemon is stopped
+signal.signal(signal.SIGTERM, sigterm_handler)
+try:
+    next_refresh = 0
+    last_tick    = (int(time.time()) // tick_duration) * tick_duration
+    awake        = time.time()
+    while True:
+        # process the ticks reached since the last loop first, as refreshing the inventory can be long (-a)
+        now = time.time()
+        while last_tick + tick_duration <= now:
+            last_tick += tick_duration
+            process_tick(last_tick, awake)
+
+        if time.time() >= next_refresh:
+            refresh_inventory()
+            next_refresh = time.time() + refresh_interval * 60
+
+        # sleep until the next tick having events (or the next refresh of the inventory)
+        next_wakeup = next_refresh
+        tick = last_tick + tick_duration
+        while tick < next_refresh:
+            if len(get_tick_events(tick)) > 0:
+                next_wakeup = tick
+                break
+            tick += tick_duration
+        if next_wakeup > time.time():
+            time.sleep(next_wakeup - time.time())
+            awake = time.time()
+except KeyboardInterrupt:
+    pass
+
+# -- the end
+log ("END SCRIPT PID={:d}".format(pid))
+exit (0)
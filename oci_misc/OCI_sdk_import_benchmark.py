@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# --------------------------------------------------------------------------------------------------------------------------
+# This script measures the start time and memory usage (max RSS) of a Python process importing the OCI Python SDK
+# - with "import oci" (all the services of the SDK are imported)
+# - with the lazy import used in some scripts of this repository (only the services used are imported)
+# Each measure is done in a new Python process, several times, and the median values are displayed
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+# Versions
+#    2026-10-19: Initial Version
+#    2026-10-19: Use import_oci_lazily() from oci_scripts_common.py instead of a copy
+# --------------------------------------------------------------------------------------------------------------------------
+
+# -- import
+import sys
+import os
+import time
+import statistics
+import subprocess
+
+# ---------- variables
+nb_runs  = 5                                    # Nb of Python processes started for each measure
+services = [ "core", "object_storage" ]         # OCI SDK services used (default)
+
+# ---- code executed in the child Python processes
+# ---- it displays the import time (seconds) and max RSS (KB on Linux, bytes on MacOS)
+CHILD_CODE = """
+import os, sys, time, resource
+t0 = time.perf_counter()
+{import_code}
+{usage_code}
+t1 = time.perf_counter()
+print (t1 - t0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+# ---- same lazy import as in the scripts (import_oci_lazily() in oci_misc/oci_scripts_common.py)
+LAZY_IMPORT_CODE = """
+sys.path.insert(0, {})
+from oci_scripts_common import import_oci_lazily
+oci = import_oci_lazily()
+""".format(repr(os.path.dirname(os.path.realpath(__file__))))
+
+# ---------- functions
+
+# ---- usage syntax
+def usage():
+    print ("Usage: {} [--runs N] [service ...]".format(sys.argv[0]))
+    print ("")
+    print ("Notes: ")
+    print ("- service is the name of an OCI SDK sub-package used by the script (ex: core, object_storage, database)")
+    print ("  default: {}".format(" ".join(services)))
+    print ("- Each measure is done in {} new Python processes (change it with --runs)".format(nb_runs))
+    exit (1)
+
+# ---- start a Python process executing code and return the import time, wall time and max RSS (MB)
+def run_child(import_code):
+    usage_code = "\n".join([ "oci.config, oci.retry, oci.pagination" ] + [ "oci.{}".format(service) for service in services ]) if import_code != "" else ""
+    code = CHILD_CODE.format(import_code=import_code, usage_code=usage_code)
+    start = time.perf_counter()
+    result = subprocess.run([ sys.executable, "-c", code ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    wall_time = time.perf_counter() - start
+    if result.returncode != 0:
+        print ("ERROR 02: cannot import OCI SDK !")
+        print (result.stderr)
+        exit (2)
+    import_time, max_rss = result.stdout.split()
+    max_rss = int(max_rss) / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return float(import_time), wall_time, max_rss
+
+# ---- run a measure nb_runs times and return median values
+def measure(import_code):
+    results = [ run_child(import_code) for i in range(nb_runs) ]
+    return [ statistics.median([ result[i] for result in results ]) for i in range(3) ]
+
+# ---------- main
+
+# -- parse arguments
+args = sys.argv[1:]
+if len(args) > 1 and args[0] == "--runs":
+    if not(args[1].isdigit()) or int(args[1]) == 0: usage()
+    nb_runs = int(args[1])
+    args = args[2:]
+if len(args) > 0:
+    if args[0].startswith("-"): usage()
+    services = args
+
+# -- measures
+measures = [ ("python only",                            measure("")),
+             ("import oci",                             measure("import oci")),
+             ("lazy import ({})".format(", ".join(services)), measure(LAZY_IMPORT_CODE)) ]
+
+# -- results
+print ("{:40s} {:>18s} {:>18s} {:>14s}".format("Mode", "Import time (ms)", "Wall time (ms)", "Max RSS (MB)"))
+for mode, (import_time, wall_time, max_rss) in measures:
+    print ("{:40s} {:18.0f} {:18.0f} {:14.1f}".format(mode, import_time * 1000, wall_time * 1000, max_rss))
+
+eager = measures[1][1]
+lazy  = measures[2][1]
+print ("")
+print ("Lazy import: wall time reduced by {:.0f} %, max RSS reduced by {:.0f} %".format(100 * (1 - lazy[1] / eager[1]), 100 * (1 - lazy[2] / eager[2])))
+
+# -- the end
+exit (0)
@@ -0,0 +1,283 @@
+# --------------------------------------------------------------------------------------------
+# Functions shared by several scripts of this repository (this file is not a script)
+#
+# - import_oci_lazily()             : import of the OCI SDK for short-lived scripts (only the services used are imported)
+# - get_instance_principal_signer(): instance principal authentication with a token cache
+#   shared by the *_INST_PRINCIPAL scripts
+# - get_client()                    : pool of OCI clients (one client per service, region and authentication)
+# - get_region(), read_ocids()      : region of a resource from its OCID, list of OCIDs from a file or stdin
+# - ActionsTracker                  : tracker of the stop/start actions of the *_stop_start_tagged scripts
+#
+# Scripts located in another folder import it with:
+#   sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+#   from oci_scripts_common import import_oci_lazily, get_instance_principal_signer
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+# Versions
+#    2026-10-19: Initial Version (instance principal token cache of the *_INST_PRINCIPAL scripts)
+#    2026-10-19: Add import_oci_lazily() (lazy import of OCI SDK, enabling FIPS mode like "import oci")
+#    2026-10-19: Add get_client() and ActionsTracker (shared by the *_stop_start_tagged scripts)
+#    2026-10-19: Cached instance principal signer is a subclass of the SDK signer (accepted by clients, refreshed on HTTP 401)
+#    2026-10-19: Add get_region_names(), get_region() and read_ocids() (shared by the tag scripts)
+# --------------------------------------------------------------------------------------------
+
+# -- import (oci is imported by the functions, after the script has imported it)
+import sys
+import os
+import json
+import time
+import base64
+import threading
+import concurrent.futures
+import importlib
+import importlib.util
+from pathlib import Path
+
+# ---------- variables
+INST_PRINCIPAL_CACHE_FILE = str(Path.home())+"/.oci/instance_principal_token.json"
+token_min_validity   = 300      # Nb of seconds a cached token must still be valid to be reused
+token_refresh_margin = 60       # Nb of seconds before expiration of the cached token when requests are signed with a new token
+poll_interval        = 5        # Nb of seconds before the first check of the tracked actions (doubled at each check)
+max_poll_interval    = 60       # Max nb of seconds between 2 checks of the tracked actions
+nb_threads           = 10       # Nb of resources checked in parallel by the tracker of actions
+
+# ---------- Functions
+
+# ---- lazy import of OCI SDK: "import oci" imports all the services of the SDK (slow start), so the sub-packages
+# ---- used by the script (oci.core, oci.config...) are only imported when first used (set OCI_LAZY_IMPORT=0 to disable)
+OCI_TOP_LEVEL_NAMES = { "BaseClient": "base_client", "Request": "request", "Response": "response", "Signer": "signer", "__version__": "version", "wait_until": "waiter" }
+
+def import_oci_lazily():
+    spec = importlib.util.find_spec("oci")
+    if os.environ.get("OCI_LAZY_IMPORT") == "0" or spec == None or spec.submodule_search_locations == None:
+        return importlib.import_module("oci")
+    module = importlib.util.module_from_spec(spec)      # oci package created without executing oci/__init__.py
+    def __getattr__(name):
+        if name in OCI_TOP_LEVEL_NAMES:
+            return getattr(importlib.import_module("oci." + OCI_TOP_LEVEL_NAMES[name]), name)
+        try:
+            return importlib.import_module("oci." + name)
+        except ModuleNotFoundError as error:
+            if error.name != "oci." + name: raise
+            raise AttributeError("module 'oci' has no attribute '{}'".format(name))
+    module.__getattr__ = __getattr__
+    sys.modules["oci"] = module
+
+    # -- enable FIPS mode (OCI_PYTHON_SDK_FIPS_LIBCRYPTO_PATH) as done by oci/__init__.py in SDK versions supporting it
+    if importlib.util.find_spec("oci.fips") != None:
+        importlib.import_module("oci.fips").enable_fips_mode()
+    return module
+
+# ---- save the security token of an instance principal signer and its session key in a protected file (mode 600)
+# ---- a token that cannot be saved does not prevent the script from running (warning on stderr)
+def save_instance_principal_token(signer):
+    from cryptography.hazmat.primitives import serialization
+    try:
+        token = signer.federation_client.get_security_token()
+        private_key = signer.federation_client.session_key_supplier.get_key_pair()["private"]
+        payload = token.split(".")[1]
+        expires = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["exp"]
+        cache = { "token": token,
+                  "private_key": private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()).decode(),
+                  "region": signer.region,
+                  "tenancy_id": signer.tenancy_id,
+                  "expires": expires }
+        os.makedirs(os.path.dirname(INST_PRINCIPAL_CACHE_FILE), mode=0o700, exist_ok=True)
+        tmp_file = "{}.{}.tmp".format(INST_PRINCIPAL_CACHE_FILE, os.getpid())
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, INST_PRINCIPAL_CACHE_FILE)
+    except Exception as error:
+        print ("WARNING: cannot save instance principal token in {}: {}".format(INST_PRINCIPAL_CACHE_FILE, error), file=sys.stderr)
+
+# ---- instance principal signer seeded with the cached security token (no metadata service and federation requests)
+# ---- it is a subclass of the SDK signer, so clients accept it without config and call refresh_security_token() on HTTP 401
+# ---- the federation client of a new SDK signer is used when the cached token is about to expire or is rejected
+# ---- (the class is created at first use as the OCI SDK is imported by the script, possibly lazily)
+def new_cached_instance_principals_signer(cache):
+    import oci
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.backends import default_backend
+
+    class CachedInstancePrincipalsSigner(oci.auth.signers.InstancePrincipalsSecurityTokenSigner):
+        def __init__(self, cache):
+            private_key = serialization.load_pem_private_key(cache["private_key"].encode(), password=None, backend=default_backend())
+            oci.auth.signers.SecurityTokenSigner.__init__(self, cache["token"], private_key)
+            self.expires    = cache["expires"]
+            self.region     = cache["region"]
+            self.tenancy_id = cache["tenancy_id"]
+            self.federation_client    = None
+            self._reset_signers_lock  = threading.Lock()
+            self.federation_lock      = threading.Lock()
+
+        # -- get the federation client of a new SDK signer (which gets a new token), created once
+        def get_federation_client(self):
+            with self.federation_lock:
+                if self.federation_client == None:
+                    signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+                    save_instance_principal_token(signer)
+                    self.session_key_supplier = signer.session_key_supplier
+                    self.federation_client    = signer.federation_client
+            return self.federation_client
+
+        # -- sign with the cached token while it is valid, then with the token of the federation client (refreshed by the SDK)
+        def __call__(self, request, enforce_content_headers=True):
+            if self.federation_client == None and time.time() < self.expires - token_refresh_margin:
+                return oci.signer.AbstractBaseSigner.__call__(self, request, enforce_content_headers)
+            self.get_federation_client()
+            return super(CachedInstancePrincipalsSigner, self).__call__(request, enforce_content_headers)
+
+        # -- called by the clients when a request is rejected (HTTP 401)
+        def refresh_security_token(self):
+            if self.federation_client == None:
+                self.get_federation_client()
+            else:
+                self.federation_client.refresh_security_token()
+                save_instance_principal_token(self)
+
+    return CachedInstancePrincipalsSigner(cache)
+
+# ---- instance principal authentication with a token cache shared by the *_INST_PRINCIPAL scripts
+# ---- the cached token is reused until it expires, so the next runs skip the metadata service and federation requests
+# ---- (set OCI_TOKEN_CACHE=0 to disable)
+def get_instance_principal_signer():
+    import oci
+    if os.environ.get("OCI_TOKEN_CACHE") == "0":
+        return oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+
+    # -- reuse the cached token if it is still valid
+    try:
+        with open(INST_PRINCIPAL_CACHE_FILE, "r") as f:
+            cache = json.load(f)
+        if cache["expires"] - time.time() > token_min_validity:
+            return new_cached_instance_principals_signer(cache)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # -- otherwise get a new token and save it
+    signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+    save_instance_principal_token(signer)
+    return signer
+
+# ---- pool of clients: one client per service, region and authentication, created on first use and reused by all threads
+clients      = {}
+clients_lock = threading.Lock()
+
+def get_client(client_class, lconfig, lsigner=None):
+    if lsigner != None:
+        key = (client_class.__name__, lsigner.region, id(lsigner))
+    else:
+        key = (client_class.__name__, lconfig["region"], lconfig.get("user"), lconfig.get("fingerprint"))
+    with clients_lock:
+        if key not in clients:
+            if lsigner != None: clients[key] = client_class(config={}, signer=lsigner)
+            else:               clients[key] = client_class(dict(lconfig))
+        return clients[key]
+
+# ---- names of the regions subscribed by the tenancy, by region key (ex: phx -> us-phoenix-1)
+def get_region_names(lconfig):
+    import oci
+    IdentityClient = oci.identity.IdentityClient(lconfig)
+    response = IdentityClient.list_region_subscriptions(lconfig["tenancy"])
+    return { region.region_key.lower(): region.region_name for region in response.data }
+
+# ---- get the region of a resource from its OCID (ocid1.<type>.<realm>.<region>.<unique_id>)
+# ---- old OCIDs contain a region key (ex: phx) instead of a region name (see get_region_names())
+def get_region(obj_id, lconfig, region_names):
+    region = obj_id.split(".")[3].lower()
+    if region == "":
+        return lconfig["region"]
+    if region in region_names:
+        return region_names[region]
+    return region
+
+# ---- read a list of OCIDs from a file or stdin (one OCID per line, empty lines and comments ignored)
+def read_ocids(input):
+    ocids = []
+    for line in input:
+        line = line.strip()
+        if line != "" and not line.startswith("#"):
+            ocids.append(line)
+    return ocids
+
+# ---- tracker of the stop/start actions: each request is recorded with the lifecycle state expected for the resource
+# ---- (action = dictionary with id, name, description, region and target keys), then the lifecycle states are polled
+# ---- in parallel with get_state(action), with an increasing interval, until all the resources reach the expected state,
+# ---- fail or the timeout is reached
+class ActionsTracker:
+    def __init__(self, get_state, failed_states):
+        self.get_state     = get_state
+        self.failed_states = failed_states
+        self.actions       = []
+        self.lock          = threading.Lock()
+
+    # -- send the request (function called with args) and record its action, which is FAILED if the request raises any error
+    def submit(self, action, function, *args):
+        import oci
+        action["status"]  = "SUBMITTED"
+        action["message"] = ""
+        try:
+            function(*args, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        except oci.exceptions.ServiceError as error:
+            action["status"]  = "FAILED"
+            action["message"] = "{} {}".format(error.status, error.message)
+        except Exception as error:
+            action["status"]  = "FAILED"
+            action["message"] = repr(error)
+        with self.lock:
+            self.actions.append(action)
+        return action
+
+    # -- get the current lifecycle state of the resource and update the status of its action (errors are checked again at next poll)
+    def update(self, action):
+        import oci
+        try:
+            state = self.get_state(action)
+        except oci.exceptions.ServiceError as error:
+            action["message"] = "{} {}".format(error.status, error.message)
+            return
+        except Exception as error:
+            action["message"] = repr(error)
+            return
+        action["message"] = state
+        if   state == action["target"]:    action["status"] = "SUCCEEDED"
+        elif state in self.failed_states:  action["status"] = "FAILED"
+
+    # -- wait (max timeout minutes) for the completion of the actions, remaining actions are TIMEOUT
+    def wait(self, timeout, progress=False):
+        from datetime import datetime
+        deadline = time.time() + timeout * 60
+        interval = poll_interval
+        pending  = [ action for action in self.actions if action["status"] == "SUBMITTED" ]
+        while len(pending) > 0 and time.time() < deadline:
+            time.sleep(max(min(interval, deadline - time.time()), 0))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+                list(executor.map(self.update, pending))
+            pending  = [ action for action in pending if action["status"] == "SUBMITTED" ]
+            if progress:
+                print ("{:s}: {:d} actions completed, {:d} in progress".format(datetime.utcnow().strftime("%T"), len(self.actions) - len(pending), len(pending)))
+            interval = min(interval * 2, max_poll_interval)
+        for action in pending:
+            action["status"] = "TIMEOUT"
+
+    # -- number of actions per status
+    def counts(self):
+        return { status: len([ action for action in self.actions if action["status"] == status ]) for status in ("SUCCEEDED", "SUBMITTED", "FAILED", "TIMEOUT") }
+
+    # -- list the failed and timed out actions
+    def display_failures(self, color="", color_normal=""):
+        for action in self.actions:
+            if action["status"] in ("FAILED", "TIMEOUT"):
+                print (color+"- {:s}: {:s} {:s} ({:s}) in region {:s}: {:s}".format(action["status"], action["description"], action["name"], action["id"], action["region"], action["message"])+color_normal)
+
+    # -- display the results of the actions and return the exit code (3 if some actions failed or timed out)
+    def display_summary(self):
+        if len(self.actions) == 0: return 0
+        counts = self.counts()
+        print ("==== {:d} actions: {:d} succeeded, {:d} not checked (use --wait), {:d} failed, {:d} timed out".format(len(self.actions), counts["SUCCEEDED"], counts["SUBMITTED"], counts["FAILED"], counts["TIMEOUT"]))
+        self.display_failures()
+        return 3 if counts["FAILED"] + counts["TIMEOUT"] > 0 else 0
@@ -11,25 +11,34 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-15-12: Initial Version
+#    2026-10-19: Add --manifest to create many requests in parallel and save their URIs in a CSV file
+#    2026-10-19: Any error of a manifest row (not only service errors) is written in the error column
+#                Fix access type for RW requests
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
 import sys
+import csv
 import datetime
+import concurrent.futures
 
 # ---------- Functions
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of requests created in parallel (--manifest)
 
 # ---- usage syntax
 def usage():
     print ("Usage: {} OCI_PROFILE bucket_name object_name par_name type days_from_now".format(sys.argv[0]))
+    print ("    or {} OCI_PROFILE bucket_name --manifest manifest_file output_file".format(sys.argv[0]))
     print ("")
     print ("Notes:")
     print ("- type values: R for Read or RW for ReadWrite")
     print ("- expiry date/time is now + <days_from_now> days. ")
+    print ("- manifest_file is a CSV file with 1 line per request: object_name,par_name,type,days_from_now")
+    print ("  requests are created in parallel and saved in CSV file output_file with their full URI or the error")
     print ("")
     print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
@@ -41,20 +50,96 @@ def usage():
     print ("region      = eu-frankfurt-1")
     exit (1)
 
+# ---- get access type from type (R or RW), None if type is not valid
+def get_access_type(type):
+    if type.upper() == "R":
+        return "ObjectRead"
+    elif type.upper() == "RW":
+        return "ObjectReadWrite"
+    return None
+
+# ---- create a PAR and return it with its full URI
+def create_par(object_name, par_name, access_type, days):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    exp_time = now + datetime.timedelta(days=days)
+    details = oci.object_storage.models.CreatePreauthenticatedRequestDetails(access_type=access_type, name=par_name, object_name=object_name, time_expires=exp_time)
+    response = ObjectStorageClient.create_preauthenticated_request(namespace, bucket, details, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    par = response.data
+    uri = f"https://objectstorage.{config['region']}.oraclecloud.com{par.access_uri}"
+    return par, uri
+
+# ---- read the manifest file and return a list of (object_name, par_name, access_type, days_from_now)
+def read_manifest(filename):
+    try:
+        f = open(filename, "r", newline="")
+    except:
+        print ("ERROR 03: cannot read manifest file {} !".format(filename))
+        exit (3)
+    rows = []
+    line_number = 0
+    for fields in csv.reader(f):
+        line_number += 1
+        if len(fields) == 0 or fields[0].startswith("#"): continue
+        try:
+            object_name, par_name, type, days = [ field.strip() for field in fields ]
+            access_type = get_access_type(type)
+            if access_type == None: raise ValueError(type)
+            rows.append((object_name, par_name, access_type, int(days)))
+        except ValueError:
+            print ("ERROR 05: syntax error in manifest file {} line {} !".format(filename, line_number))
+            exit (5)
+    f.close()
+    return rows
+
+# ---- create a PAR for a manifest row and return the row for the output file
+def create_par_from_row(row):
+    object_name, par_name, access_type, days = row
+    try:
+        par, uri = create_par(object_name, par_name, access_type, days)
+        return [ object_name, par_name, access_type, par.time_expires, uri, "" ]
+    except oci.exceptions.ServiceError as error:
+        return [ object_name, par_name, access_type, "", "", "{} {}".format(error.code, error.message) ]
+    except Exception as error:
+        return [ object_name, par_name, access_type, "", "", str(error) or error.__class__.__name__ ]
+
+# ---- create all PARs of the manifest in parallel and save results in the output CSV file
+def create_pars_from_manifest(manifest_file, output_file):
+    rows = read_manifest(manifest_file)
+    try:
+        f = open(output_file, "w", newline="")
+    except:
+        print ("ERROR 06: cannot create output file {} !".format(output_file))
+        exit (6)
+    writer = csv.writer(f)
+    writer.writerow([ "object_name", "par_name", "access_type", "time_expires", "uri", "error" ])
+    nb_errors = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        for result in executor.map(create_par_from_row, rows):
+            writer.writerow(result)
+            if result[5] != "": nb_errors += 1
+    f.close()
+    print ("{} pre-authenticated requests created, {} errors: see {}".format(len(rows)-nb_errors, nb_errors, output_file))
+    if nb_errors > 0:
+        exit (7)
 
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) != 7: 
+if len(sys.argv) == 7:
+    manifest = False
+    profile  = sys.argv[1]
+    bucket   = sys.argv[2]
+    object   = sys.argv[3]
+    par_name = sys.argv[4]
+    type     = sys.argv[5]
+    days_fnow= sys.argv[6]
+elif len(sys.argv) == 6 and sys.argv[3] == "--manifest":
+    manifest = True
+    profile  = sys.argv[1]
+    bucket   = sys.argv[2]
+else:
     usage()
 
-profile  = sys.argv[1] 
-bucket   = sys.argv[2]
-object   = sys.argv[3]
-par_name = sys.argv[4]
-type     = sys.argv[5]
-days_fnow= sys.argv[6]
-
 # -- load profile from config file and exists if profile does not exist
 try:
     config = oci.config.from_file(configfile, profile)
@@ -63,28 +148,21 @@ except:
     print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
     exit (2)
 
-IdentityClient = oci.identity.IdentityClient(config)
-user = IdentityClient.get_user(config["user"]).data
-RootCompartmentID = user.compartment_id
-
-# -- Get the preauth requests for the bucket
+# -- Object storage client and namespace (shared by all requests)
 ObjectStorageClient = oci.object_storage.ObjectStorageClient(config)
 namespace = ObjectStorageClient.get_namespace().data
 
+# -- Create PARs from manifest
+if manifest:
+    create_pars_from_manifest(sys.argv[4], sys.argv[5])
+    exit (0)
+
 # -- Create a PAR
-if type.upper() == "R":
-    access_type = "ObjectRead"
-elif type.upper() == "RW":
-    access_type = "ObjectRead"
-else:
+access_type = get_access_type(type)
+if access_type == None:
     usage()
 
-now = datetime.datetime.now(datetime.timezone.utc)
-exp_time = now + datetime.timedelta(days=int(days_fnow))
-details = oci.object_storage.models.PreauthenticatedRequest(access_type=access_type , name = par_name, object_name = object,  time_expires = exp_time)
-response = ObjectStorageClient.create_preauthenticated_request (namespace, bucket, details)
-par = response.data
-uri = f"https://objectstorage.{config['region']}.oraclecloud.com{par.access_uri}"
+par, uri = create_par(object, par_name, access_type, int(days_fnow))
 print (f"Preauthenticated requests for object {object} created !")
 print ("- URI         = ",uri)
 print ("- access type = ",par.access_type)
@@ -12,6 +12,7 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-15-12: Initial Version
+#    2026-10-19: Display "<bucket>" as object name of bucket-level requests (object name is None)
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
@@ -80,7 +81,7 @@ now = datetime.datetime.now(datetime.timezone.utc)
 print ("List of pre-authenticated requests for bucket {:s}:".format(bucket))
 nb = 1
 for auth in response.data:
-    print ('{:2d}) {:50s} {:50s} {}'.format(nb, auth.name, auth.object_name, auth.time_expires))
+    print ('{:2d}) {:50s} {:50s} {}'.format(nb, auth.name, auth.object_name or "<bucket>", auth.time_expires))
     nb += 1
 
 print ("")
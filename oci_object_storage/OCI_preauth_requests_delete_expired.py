@@ -11,21 +11,36 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-03-25: Initial Version
+#    2026-10-19: Delete requests in parallel with retries, add --yes for non interactive use
+#    2026-10-19: Add bucket_name "all" to delete expired requests of all buckets in all compartments and -a for all regions
+#    2026-10-19: Add --list_only (requests of all buckets listed with their expiry status, used by OCI_preauth_requests_list.py)
+#    2026-10-19: Remove --list_only: sweep of all buckets moved to oci_preauth_requests_common.py (also used by OCI_preauth_requests_list.py)
+#    2026-10-19: Display "<bucket>" as object name of bucket-level requests (object name is None)
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
 import sys
 import datetime
+import threading
+import concurrent.futures
+from oci_preauth_requests_common import get_object_storage_clients, sweep_pars
 
 # ---------- Functions
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of deletions done in parallel
 
 # ---- usage syntax
 def usage():
-    print ("Usage: {} OCI_PROFILE bucket_name".format(sys.argv[0]))
+    print ("Usage: {} [-a] [--yes] [--threads nb_threads] OCI_PROFILE bucket_name".format(sys.argv[0]))
+    print ("")
+    print ("Notes:")
+    print ("- Use bucket_name \"all\" to process all buckets in all compartments")
+    print ("- If -a is provided, all subscribed regions are processed (by default, only the region in the profile is processed)")
+    print ("- If --yes is provided, expired requests are deleted without asking for confirmation (cron use)")
+    print ("- Requests are deleted in parallel by {} threads (change it with --threads)".format(nb_threads))
     print ("")
     print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
@@ -37,14 +52,46 @@ def usage():
     print ("region      = eu-frankfurt-1")
     exit (1)
 
+# ---- delete a preauth request (throttled requests are retried by the retry strategy)
+def delete_par(item):
+    global nb_deleted
+    region, cpt_name, bucket_name, auth = item
+    try:
+        clients[region].delete_preauthenticated_request(namespace_name=namespace, bucket_name=bucket_name, par_id=auth.id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        error = None
+    except oci.exceptions.ServiceError as e:
+        error = "{} {}".format(e.status, e.code)
+    except Exception as e:
+        error = str(e)
+    with lock:
+        if error == None:
+            nb_deleted += 1
+        else:
+            failures.append((item, error))
+        nb_done = nb_deleted + len(failures)
+        if (nb_done % 100 == 0) or (nb_done == nb_expired):
+            print ("\rDeleted {}/{} pre-authenticated requests ({} failed)".format(nb_deleted, nb_expired, len(failures)), end='', flush=True)
+
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) != 3: 
+confirmed   = False
+all_regions = False
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("-"):
+    if   args[0] == "--yes": confirmed = True
+    elif args[0] == "-a": all_regions = True
+    elif args[0] == "--threads" and len(args) > 1 and args[1].isdigit() and int(args[1]) > 0:
+        nb_threads = int(args[1])
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if (len(args) != 2) or (all_regions and args[1] != "all"):
     usage()
 
-profile  = sys.argv[1] 
-bucket   = sys.argv[2]
+profile  = args[0] 
+bucket   = args[1]
 
 # -- load profile from config file and exists if profile does not exist
 try:
@@ -57,42 +104,70 @@ except:
 IdentityClient = oci.identity.IdentityClient(config)
 user = IdentityClient.get_user(config["user"]).data
 RootCompartmentID = user.compartment_id
+profile_region = config["region"]
 
-# -- Get the preauth requests for the bucket
-ObjectStorageClient = oci.object_storage.ObjectStorageClient(config)
-namespace = ObjectStorageClient.get_namespace().data
-try:
-    response = oci.pagination.list_call_get_all_results(ObjectStorageClient.list_preauthenticated_requests, namespace_name=namespace, bucket_name=bucket)
-except:
-    print ("ERROR 04: bucket {} not found !".format(bucket))
-    exit (4)
-
-# -- Exit script if no preauth requests found
-if len(response.data) == 0:
-    print ("No pre-authenticated requests found for this bucket !")
-    exit (0)
+# -- Object storage clients: 1 per region (all subscribed regions if -a is provided)
+clients, namespace = get_object_storage_clients(config, IdentityClient, RootCompartmentID, all_regions)
+ObjectStorageClient = clients[profile_region]
 
 # -- Get current date and time
 now = datetime.datetime.now(datetime.timezone.utc)
 
-# -- List expired requests
-print ("List of expired pre-authenticated requests for bucket {:s}:".format(bucket))
-for auth in response.data:
-    if auth.time_expires < now:
-        print ('- {:50s} {:50s} {}'.format(auth.name, auth.object_name, auth.time_expires))
+# -- Get the expired preauth requests for the bucket or for all buckets
+expired = []
+if bucket == "all":
+    print ("List of expired pre-authenticated requests for all buckets: (region, compartment, bucket, name, object name, time expires)")
+    for region, cpt_name, bucket_name, pars in sweep_pars(clients, namespace, IdentityClient, RootCompartmentID, nb_threads):
+        for auth in pars:
+            if auth.time_expires < now:
+                expired.append((region, cpt_name, bucket_name, auth))
+                print ('- {}, {}, {}, {}, {}, {}'.format(region, cpt_name, bucket_name, auth.name, auth.object_name or "<bucket>", auth.time_expires))
+else:
+    try:
+        response = oci.pagination.list_call_get_all_results(ObjectStorageClient.list_preauthenticated_requests, namespace_name=namespace, bucket_name=bucket)
+    except:
+        print ("ERROR 04: bucket {} not found !".format(bucket))
+        exit (4)
+
+    # -- Exit script if no preauth requests found
+    if len(response.data) == 0:
+        print ("No pre-authenticated requests found for this bucket !")
+        exit (0)
+
+    expired = [ (profile_region, "", bucket, auth) for auth in response.data if auth.time_expires < now ]
+    if len(expired) > 0:
+        print ("List of expired pre-authenticated requests for bucket {:s}:".format(bucket))
+    for (region, cpt_name, bucket_name, auth) in expired:
+        print ('- {:50s} {:50s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
+
+nb_expired = len(expired)
+if nb_expired == 0:
+    print ("No expired pre-authenticated requests found !")
+    exit (0)
 
-# -- Ask to confirm deletion
+# -- Ask to confirm deletion (unless --yes is provided)
+print ("")
+if not(confirmed):
+    answer = input ("Do you confirm deletion of those {} requests ? (y/n): ".format(nb_expired))
+    if answer != "y":
+        print ("Deletion not confirmed. Exiting !")
+        exit (5)
+
+# -- Delete the requests in parallel
+nb_deleted = 0
+failures   = []
+lock       = threading.Lock()
+with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+    executor.map(delete_par, expired)
 print ("")
-answer = input ("Do you confirm deletion of those requests ? (y/n): ")
-if answer != "y":
-    print ("Deletion not confirmed. Exiting !")
-    exit (5)
-
-# -- Delete the requests
-for auth in response.data:
-    if auth.time_expires < now:
-        oci.object_storage.ObjectStorageClient.delete_preauthenticated_request(ObjectStorageClient, namespace_name=namespace, bucket_name=bucket, par_id=auth.id)
-    
+
+# -- Display failed deletions
+if len(failures) > 0:
+    print ("Failed deletions:")
+    for (region, cpt_name, bucket_name, auth), error in failures:
+        print ('- {}, {}, {}, {}, {}'.format(region, bucket_name, auth.name, auth.object_name or "<bucket>", error))
+    exit (6)
+
 print ("Pre-authenticated requests deleted !")
 
 # -- the end
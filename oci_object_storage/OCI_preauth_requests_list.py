@@ -12,12 +12,24 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-03-25: Initial Version
+#    2026-10-19: Add bucket_name "all" to list requests of all buckets in all compartments and -a for all regions
+#    2026-10-19: Add --sorted, --expiring_within and --prefix_summary options (requests sorted by expiry date)
+#    2026-10-19: Import only the OCI SDK services used by the script (faster start)
+#    2026-10-19: Lazy import of OCI SDK moved to oci_misc/oci_scripts_common.py (FIPS mode enabled as with "import oci")
+#    2026-10-19: Bucket_name "all" listed by OCI_preauth_requests_delete_expired.py --list_only (single sweep code)
+#    2026-10-19: Bucket_name "all" listed with the sweep functions of oci_preauth_requests_common.py (no call to the delete script)
+#    2026-10-19: Display "<bucket>" as object name of bucket-level requests (object name is None)
 # --------------------------------------------------------------------------------------------------------------------------
 
 # -- import
-import oci
 import sys
+import os
+import bisect
 import datetime
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "oci_misc"))
+from oci_scripts_common import import_oci_lazily
+oci = import_oci_lazily()             # only the OCI SDK services used are imported (faster start)
+from oci_preauth_requests_common import get_object_storage_clients, sweep_pars, display_all_pars
 
 # ---------- Colors for output
 # see https://misc.flogisoft.com/bash/tip_colors_and_formatting to customize
@@ -39,10 +51,20 @@ else:
 
 # ---- variables
 configfile = "~/.oci/config"    # Define config file to be used.
+nb_threads = 10                 # Nb of buckets listed in parallel (bucket_name "all")
 
 # ---- usage syntax
 def usage():
-    print ("Usage: {} OCI_PROFILE bucket_name".format(sys.argv[0]))
+    print ("Usage: {} [-a] OCI_PROFILE bucket_name".format(sys.argv[0]))
+    print ("    or {} [--sorted] [--expiring_within days] [--prefix_summary] OCI_PROFILE bucket_name".format(sys.argv[0]))
+    print ("")
+    print ("Notes:")
+    print ("- If --sorted is provided, requests are sorted by expiry date (active requests expiring first are listed first)")
+    print ("- If --expiring_within is provided, only active requests expiring in the next <days> days are listed (sorted)")
+    print ("- If --prefix_summary is provided, the number of active and expired requests and the next expiry date are")
+    print ("  displayed for each object prefix (part of object name before first /) instead of the list of requests")
+    print ("- Use bucket_name \"all\" to list requests of all buckets in all compartments (in parallel) with their expiry status")
+    print ("- If -a is provided, all subscribed regions are processed (by default, only the region in the profile is processed)")
     print ("")
     print ("note: OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
@@ -54,15 +76,81 @@ def usage():
     print ("region      = eu-frankfurt-1")
     exit (1)
 
+# ---- display requests sorted by expiry date
+# ---- requests are sorted once, then active/expired/expiring soon requests are found by binary search on expiry dates
+def display_sorted_pars(pars):
+    pars = sorted(pars, key=lambda auth: auth.time_expires)
+    times = [ auth.time_expires for auth in pars ]
+    first_active = bisect.bisect_right(times, now)
+
+    if expiring_within != None:
+        limit = bisect.bisect_right(times, now + datetime.timedelta(days=expiring_within))
+        print (COLOR_TITLE + "List of pre-authenticated requests for bucket ",end='')
+        print (COLOR_BUCKET + bucket + COLOR_TITLE + " expiring in the next {} days: (name, object-name, time-expires)".format(expiring_within) + COLOR_ACTIVE)
+        for auth in pars[first_active:limit]:
+            print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
+        print (COLOR_NORMAL)
+        return
+
+    print (COLOR_TITLE + "List of ACTIVE pre-authenticated requests for bucket ",end='')
+    print (COLOR_BUCKET + bucket + COLOR_TITLE + ": (name, object-name, time-expires)" + COLOR_ACTIVE)
+    for auth in pars[first_active:]:
+        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
+    print ("")
+    print (COLOR_TITLE + "List of EXPIRED pre-authenticated requests for bucket ",end='')
+    print (COLOR_BUCKET + bucket + COLOR_TITLE + ": (name, object-name, time-expires)" + COLOR_EXPIRED)
+    for auth in reversed(pars[:first_active]):
+        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
+    print (COLOR_NORMAL)
+
+# ---- display number of active and expired requests and next expiry date per object prefix (single pass)
+def display_prefix_summary(pars):
+    summary = {}
+    for auth in pars:
+        name   = auth.object_name or "<bucket>"      # object_name is None for bucket-level requests
+        prefix = name.split("/")[0] + "/" if "/" in name else name
+        if prefix not in summary:
+            summary[prefix] = [ 0, 0, None ]
+        if auth.time_expires > now:
+            summary[prefix][0] += 1
+            if (summary[prefix][2] == None) or (auth.time_expires < summary[prefix][2]):
+                summary[prefix][2] = auth.time_expires
+        else:
+            summary[prefix][1] += 1
+
+    # prefixes with the nearest next expiry first, prefixes without active requests last
+    far_future = datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    print (COLOR_TITLE + "Pre-authenticated requests per object prefix for bucket ",end='')
+    print (COLOR_BUCKET + bucket + COLOR_TITLE + ": (prefix, active, expired, next expiry)" + COLOR_NORMAL)
+    for prefix, (nb_active, nb_expired, next_expiry) in sorted(summary.items(), key=lambda item: item[1][2] or far_future):
+        print ('- {:55s} {}{:6d}{} {}{:6d}{} {}'.format(prefix, COLOR_ACTIVE, nb_active, COLOR_NORMAL, COLOR_EXPIRED, nb_expired, COLOR_NORMAL, next_expiry or "-"))
 
 # ------------ main
 
 # -- parse arguments
-if len(sys.argv) != 3: 
+all_regions     = False
+sorted_list     = False
+expiring_within = None
+prefix_summary  = False
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("-"):
+    if   args[0] == "-a": all_regions = True
+    elif args[0] == "--sorted": sorted_list = True
+    elif args[0] == "--prefix_summary": prefix_summary = True
+    elif args[0] == "--expiring_within" and len(args) > 1 and args[1].isdigit():
+        expiring_within = int(args[1])
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if len(args) != 2:
+    usage()
+profile  = args[0]
+bucket   = args[1]
+if all_regions and bucket != "all":
+    usage()
+if (sorted_list or prefix_summary or expiring_within != None) and (bucket == "all"):
     usage()
-
-profile  = sys.argv[1] 
-bucket   = sys.argv[2]
 
 # -- load profile from config file and exists if profile does not exist
 try:
@@ -76,6 +164,15 @@ IdentityClient = oci.identity.IdentityClient(config)
 user = IdentityClient.get_user(config["user"]).data
 RootCompartmentID = user.compartment_id
 
+# -- Get current date and time
+now = datetime.datetime.now(datetime.timezone.utc)
+
+# -- All buckets: list requests of all buckets in all compartments with their expiry status
+if bucket == "all":
+    clients, namespace = get_object_storage_clients(config, IdentityClient, RootCompartmentID, all_regions)
+    display_all_pars(sweep_pars(clients, namespace, IdentityClient, RootCompartmentID, nb_threads), now)
+    exit (0)
+
 # -- Get the preauth requests for the bucket
 ObjectStorageClient = oci.object_storage.ObjectStorageClient(config)
 namespace = ObjectStorageClient.get_namespace().data
@@ -90,15 +187,20 @@ if len(response.data) == 0:
     print ("No pre-authenticated requests found for this bucket !")
     exit (0)
 
-# -- Get current date and time
-now = datetime.datetime.now(datetime.timezone.utc)
+# -- Sorted list or summary per prefix
+if prefix_summary:
+    display_prefix_summary(response.data)
+    exit (0)
+if sorted_list or expiring_within != None:
+    display_sorted_pars(response.data)
+    exit (0)
 
 # -- List active requests
 print (COLOR_TITLE + "List of ACTIVE pre-authenticated requests for bucket ",end='')
 print (COLOR_BUCKET + bucket + COLOR_TITLE + ": (name, object-name, time-expires)" + COLOR_ACTIVE)
 for auth in response.data:
     if auth.time_expires > now:
-        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name, auth.time_expires))
+        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
 
 print ("")
 
@@ -107,7 +209,7 @@ print (COLOR_TITLE + "List of EXPIRED pre-authenticated requests for bucket ",en
 print (COLOR_BUCKET + bucket + COLOR_TITLE + ": (name, object-name, time-expires)" + COLOR_EXPIRED)
 for auth in response.data:
     if auth.time_expires <= now:
-        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name, auth.time_expires))
+        print ('- {:50s} {:55s} {}'.format(auth.name, auth.object_name or "<bucket>", auth.time_expires))
 
 print (COLOR_NORMAL)
 
@@ -0,0 +1,97 @@
+# --------------------------------------------------------------------------------------------------------------------------
+# Functions shared by OCI_preauth_requests_list.py and OCI_preauth_requests_delete_expired.py (this file is not a script)
+#
+# - get_object_storage_clients(): object storage clients (1 per region) and namespace
+# - sweep_pars()                : pre-authenticated requests of all buckets in all compartments (in parallel)
+# - display_all_pars()          : display the requests found by sweep_pars() with their expiry status
+#
+# The scripts import OCI SDK (import oci or import_oci_lazily()) before importing this file
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+#
+# prerequisites : - Python 3 with OCI Python SDK installed
+# Versions
+#    2026-10-19: Initial Version (tenancy-wide sweep of OCI_preauth_requests_delete_expired.py)
+#    2026-10-19: Display "<bucket>" as object name of bucket-level requests (object name is None)
+# --------------------------------------------------------------------------------------------------------------------------
+
+# -- import
+import oci
+import sys
+import concurrent.futures
+
+# ---------- Colors for output
+# see https://misc.flogisoft.com/bash/tip_colors_and_formatting to customize
+colored_output=True
+if (colored_output):
+  COLOR_TITLE = "\033[93m"            # light yellow
+  COLOR_EXPIRED = "\033[91m"          # light red
+  COLOR_ACTIVE = "\033[32m"           # green
+  COLOR_NORMAL = "\033[39m"
+else:
+  COLOR_TITLE = ""
+  COLOR_EXPIRED = ""
+  COLOR_ACTIVE = ""
+  COLOR_NORMAL = ""
+
+# ---------- Functions
+
+# ---- object storage clients: 1 for the region of the profile or 1 per subscribed region (all_regions), and namespace
+def get_object_storage_clients(config, IdentityClient, tenancy_id, all_regions):
+    clients = { config["region"]: oci.object_storage.ObjectStorageClient(config) }
+    if all_regions:
+        for region in oci.pagination.list_call_get_all_results(IdentityClient.list_region_subscriptions, tenancy_id).data:
+            clients[region.region_name] = oci.object_storage.ObjectStorageClient(dict(config, region=region.region_name))
+    namespace = clients[config["region"]].get_namespace().data
+    return clients, namespace
+
+# ---- get the list of buckets in a compartment in a region
+def list_buckets_in_compartment(client, namespace, region, cpt_id, cpt_name):
+    try:
+        response = oci.pagination.list_call_get_all_results(client.list_buckets, namespace_name=namespace, compartment_id=cpt_id, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        return [ (region, cpt_name, bucket.name) for bucket in response.data ]
+    except:
+        print ("WARNING: cannot list buckets in compartment {} in region {} !".format(cpt_name, region), file=sys.stderr)
+        return []
+
+# ---- get the list of preauth requests for a bucket
+def list_pars_in_bucket(client, namespace, region, cpt_name, bucket_name):
+    try:
+        response = oci.pagination.list_call_get_all_results(client.list_preauthenticated_requests, namespace_name=namespace, bucket_name=bucket_name, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        return region, cpt_name, bucket_name, response.data
+    except:
+        print ("WARNING: cannot list pre-authenticated requests in bucket {} in region {} !".format(bucket_name, region), file=sys.stderr)
+        return region, cpt_name, bucket_name, []
+
+# ---- list buckets in all compartments of the regions of the clients, then list preauth requests of each bucket
+# ---- everything is done in parallel and results (region, compartment, bucket, requests) are returned bucket by bucket
+# ---- as soon as they are available
+def sweep_pars(clients, namespace, IdentityClient, root_compartment_id, nb_threads):
+    compartments = oci.pagination.list_call_get_all_results(IdentityClient.list_compartments, root_compartment_id, compartment_id_in_subtree=True).data
+    compartments = [ (root_compartment_id, "root") ] + [ (cpt.id, cpt.name) for cpt in compartments if cpt.lifecycle_state == "ACTIVE" ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nb_threads) as executor:
+        futures = [ executor.submit(list_buckets_in_compartment, client, namespace, region, cpt_id, cpt_name) for region, client in clients.items() for (cpt_id, cpt_name) in compartments ]
+        buckets = []
+        for future in concurrent.futures.as_completed(futures):
+            buckets.extend(future.result())
+        futures = [ executor.submit(list_pars_in_bucket, clients[region], namespace, region, cpt_name, bucket_name) for (region, cpt_name, bucket_name) in buckets ]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+# ---- display preauth requests returned by sweep_pars() as soon as they are available, with expiry status at date now
+def display_all_pars(sweep, now):
+    nb_buckets = 0
+    nb_active  = 0
+    nb_expired = 0
+    print (COLOR_TITLE + "Region, Compartment, Bucket, Status, Name, Object name, Time expires" + COLOR_NORMAL)
+    for region, cpt_name, bucket_name, pars in sweep:
+        nb_buckets += 1
+        for auth in pars:
+            if auth.time_expires > now:
+                nb_active += 1
+                print (COLOR_ACTIVE + "{}, {}, {}, ACTIVE, {}, {}, {}".format(region, cpt_name, bucket_name, auth.name, auth.object_name or "<bucket>", auth.time_expires) + COLOR_NORMAL)
+            else:
+                nb_expired += 1
+                print (COLOR_EXPIRED + "{}, {}, {}, EXPIRED, {}, {}, {}".format(region, cpt_name, bucket_name, auth.name, auth.object_name or "<bucket>", auth.time_expires) + COLOR_NORMAL)
+    print (COLOR_TITLE + "{} buckets: {} active and {} expired pre-authenticated requests".format(nb_buckets, nb_active, nb_expired) + COLOR_NORMAL)
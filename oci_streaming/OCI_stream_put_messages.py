@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+# --------------------------------------------------------------------------------------------------------------
+# This script puts messages read from a file (or stdin) in an OCI stream, by batches
+# It can be used to load test a stream or to backfill a stream with messages saved by OCI_stream_read_messages.py
+#
+# Author        : Christophe Pauliat
+# Platforms     : MacOS / Linux
+# prerequisites : - Python 3 with OCI Python SDK installed
+#                 - OCI config file configured with profiles
+# Versions
+#    2026-10-19: Initial Version
+#    2026-10-19: Retry HTTP 5xx errors, count unexpected errors as failed messages, leave room for the JSON envelope
+#    2026-10-19: Keep the order of the messages of a key (batches of a key sent one after the other)
+# --------------------------------------------------------------------------------------------------------------
+
+# -- import
+import oci
+import sys
+import json
+import time
+import zlib
+import threading
+import concurrent.futures
+from base64 import b64encode
+
+# ---------- Colors for output
+COLOR_YELLOW="\033[93m"
+COLOR_RED="\033[91m"
+COLOR_GREEN="\033[32m"
+COLOR_NORMAL="\033[39m"
+COLOR_CYAN="\033[96m"
+
+# ---------- variables
+configfile  = "~/.oci/config"    # OCI config file to be used
+max_request_size = 1024 * 1024   # Max size of a put_messages request (1 MB limit, base64 encoded keys and values)
+entry_overhead   = 64            # Nb of bytes added by the JSON envelope of each message ({"key":...,"value":...})
+request_margin   = 1024          # Nb of bytes kept for the JSON envelope of the request and rounding
+max_messages_per_request = 500   # Max nb of messages in a put_messages request
+nb_inflight = 4                  # Nb of put_messages requests sent in parallel (nb of lanes of messages)
+max_retries = 5                  # Max nb of retries for throttled messages (HTTP 429 or TooManyRequests errors) and HTTP 5xx errors
+retry_wait  = 0.5                # Nb of seconds to wait before the first retry (doubled at each retry)
+nb_errors_displayed = 10         # Max nb of failed messages displayed at the end
+
+# ---------- functions
+def usage():
+    print ("Usage: {} [--format lines|jsonl] [--inflight nb_requests] OCI_PROFILE stream-id [input_file]".format(sys.argv[0]))
+    print ("")
+    print ("Notes: ")
+    print ("- Messages are read from input_file or from stdin if input_file is not provided")
+    print ("- With --format lines (default), each line of input is the value of a message (no key)")
+    print ("- With --format jsonl, each line of input is a JSON object with base64 encoded \"key\" (optional) and \"value\"")
+    print ("  This is the format written by OCI_stream_read_messages.py --sink jsonl")
+    print ("- Messages are sent by batches of up to {} messages and {} bytes, with {} batches in flight".format(max_messages_per_request, max_request_size, nb_inflight))
+    print ("  (change it with --inflight). Throttled messages and requests failing with a 5xx error are retried up to {} times".format(max_retries))
+    print ("- Messages with the same key are sent in the order of the input: a key is always sent by the same lane")
+    print ("  and each lane sends its batches one after the other")
+    print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
+    print ("")
+    print ("[EMEAOSCf]")
+    print ("tenancy     = ocid1.tenancy.oc1..aaaaaaaaw7e6nkszrry6d5hxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("user        = ocid1.user.oc1..aaaaaaaayblfepjieoxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx")
+    print ("fingerprint = 19:1d:7b:3a:17:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx:xx")
+    print ("key_file    = /Users/cpauliat/.oci/api_key.pem")
+    print ("region      = eu-frankfurt-1")
+    exit (1)
+
+# ---- read messages from input and return them as (key, value) tuples, base64 encoded
+def read_messages(input):
+    line_number = 0
+    for line in input:
+        line_number += 1
+        if input_format == "lines":
+            yield None, b64encode(line.rstrip(b"\n")).decode()
+        elif line.strip() != b"":
+            try:
+                message = json.loads(line)
+                yield message.get("key"), message["value"]
+            except:
+                print ("ERROR 03: syntax error in input line {} !".format(line_number))
+                exit (3)
+
+# ---- group messages in batches respecting the size and count limits of put_messages requests
+# ---- (size of the base64 encoded keys and values + JSON envelope of each message and of the request)
+# ---- messages are dispatched to nb_inflight lanes: all the messages of a key go to the same lane (hash of the key)
+# ---- and messages without key go to the same lane until its batch is full, then to the next lane
+# ---- return (lane, batch) tuples
+def build_batches(messages):
+    batches = [ [] for lane in range(nb_inflight) ]
+    batches_size = [ 0 ] * nb_inflight
+    keyless_lane = 0
+    for key, value in messages:
+        lane = zlib.crc32(key.encode()) % nb_inflight if key else keyless_lane
+        message_size = len(value) + (len(key) if key else 0) + entry_overhead
+        if len(batches[lane]) > 0 and (len(batches[lane]) == max_messages_per_request or batches_size[lane] + message_size > max_request_size - request_margin):
+            yield lane, batches[lane]
+            batches[lane] = []
+            batches_size[lane] = 0
+            if lane == keyless_lane:
+                keyless_lane = (keyless_lane + 1) % nb_inflight
+        batches[lane].append(oci.streaming.models.PutMessagesDetailsEntry(key=key, value=value))
+        batches_size[lane] += message_size
+    for lane in range(nb_inflight):
+        if len(batches[lane]) > 0:
+            yield lane, batches[lane]
+
+# ---- send a batch of messages and retry throttled messages (or all messages after a HTTP 429 or 5xx error)
+# ---- return the nb of accepted messages, the nb of throttled messages and the list of failed messages with error
+def send_batch(entries):
+    nb_accepted  = 0
+    nb_throttled = 0
+    failures = []
+    wait = retry_wait
+    for attempt in range(max_retries + 1):
+        retry_entries = []
+        retry_error   = "TooManyRequests"
+        try:
+            response = StreamClient.put_messages(stream_id, oci.streaming.models.PutMessagesDetails(messages=entries))
+            for entry, result in zip(entries, response.data.entries):
+                if result.error == None:
+                    nb_accepted += 1
+                elif result.error == "TooManyRequests":
+                    retry_entries.append(entry)
+                else:
+                    failures.append((entry, "{} {}".format(result.error, result.error_message)))
+        except oci.exceptions.ServiceError as error:
+            if error.status != 429 and error.status < 500:
+                failures.extend([ (entry, "{} {}".format(error.code, error.message)) for entry in entries ])
+                break
+            retry_entries = entries
+            retry_error   = "{} {}".format(error.status, error.code)
+        except Exception as error:
+            failures.extend([ (entry, str(error)) for entry in entries ])
+            break
+        if len(retry_entries) == 0:
+            break
+        nb_throttled += len(retry_entries)
+        if attempt == max_retries:
+            failures.extend([ (entry, "{} (max retries reached)".format(retry_error)) for entry in retry_entries ])
+            break
+        entries = retry_entries
+        time.sleep(wait)
+        wait *= 2
+    return nb_accepted, nb_throttled, failures
+
+# ---- update counters when a batch is completed
+def batch_completed(future):
+    global nb_accepted, nb_throttled
+    try:
+        accepted, throttled, batch_failures = future.result()
+        with lock:
+            nb_accepted  += accepted
+            nb_throttled += throttled
+            failures.extend(batch_failures)
+    finally:
+        inflight.release()
+
+# ---------- main
+
+# -- parsing arguments
+input_format = "lines"
+args = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("--"):
+    if   args[0] == "--format" and len(args) > 1 and args[1] in ("lines", "jsonl"):
+        input_format = args[1]
+        args = args[1:]
+    elif args[0] == "--inflight" and len(args) > 1 and args[1].isdigit() and int(args[1]) > 0:
+        nb_inflight = int(args[1])
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if len(args) == 2:
+    input = sys.stdin.buffer
+elif len(args) == 3:
+    try:
+        input = open(args[2], "rb")
+    except:
+        print ("ERROR 04: cannot open input file {} !".format(args[2]))
+        exit (4)
+else:
+    usage()
+
+profile   = args[0]
+stream_id = args[1]
+
+# -- get OCI Config
+try:
+    config = oci.config.from_file(configfile,profile)
+except:
+    print ("ERROR 02: profile '{}' not found in config file {} !".format(profile,configfile))
+    exit (2)
+
+# -- Stream client
+endpoint = "https://cell-1.streaming."+config["region"]+".oci.oraclecloud.com"
+StreamClient = oci.streaming.StreamClient(config, endpoint)
+
+# -- Send batches of messages, keeping nb_inflight requests in progress (1 per lane, batches of a lane sent in order)
+# -- at most 2 x nb_inflight batches are waiting or in progress (+ 1 batch being built per lane)
+nb_sent      = 0
+bytes_sent   = 0
+nb_accepted  = 0
+nb_throttled = 0
+failures     = []
+lock         = threading.Lock()
+inflight     = threading.BoundedSemaphore(2 * nb_inflight)
+start_time   = time.time()
+
+lanes = [ concurrent.futures.ThreadPoolExecutor(max_workers=1) for lane in range(nb_inflight) ]
+for lane, batch in build_batches(read_messages(input)):
+    inflight.acquire()
+    nb_sent    += len(batch)
+    bytes_sent += sum([ len(entry.value) + (len(entry.key) if entry.key else 0) for entry in batch ])
+    lanes[lane].submit(send_batch, batch).add_done_callback(batch_completed)
+for executor in lanes:
+    executor.shutdown(wait=True)
+
+elapsed = max(time.time() - start_time, 0.001)
+
+# -- display results
+print (COLOR_GREEN+"==== {} messages sent in {:.1f} seconds: {:.1f} messages/sec, {:.1f} bytes/sec (base64 encoded)".format(nb_sent, elapsed, nb_sent/elapsed, bytes_sent/elapsed)+COLOR_NORMAL)
+print (COLOR_GREEN+"==== {} messages accepted ({:.1f} %), {} failed".format(nb_accepted, 100*nb_accepted/max(nb_sent, 1), len(failures))+COLOR_NORMAL)
+print (COLOR_YELLOW+"==== {} throttled messages retried (or messages retried after a 5xx error)".format(nb_throttled)+COLOR_NORMAL)
+for entry, error in failures[:nb_errors_displayed]:
+    print (COLOR_RED+"- FAILED: key={} value={}...: {}".format(entry.key, entry.value[:40], error)+COLOR_NORMAL)
+if len(failures) > nb_errors_displayed:
+    print (COLOR_RED+"- ... and {} other failed messages".format(len(failures)-nb_errors_displayed)+COLOR_NORMAL)
+
+# -- exit with an error code if some messages were not accepted
+if len(failures) > 0:
+    exit (5)
+exit (0)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 # --------------------------------------------------------------------------------------------------------------
-# This script read messages from an OCI stream
+# This script read messages from an OCI stream
 #
 # Author        : Christophe Pauliat
 # Platforms     : MacOS / Linux
@@ -9,11 +9,22 @@
 #                 - OCI config file configured with profiles
 # Versions
 #    2020-11-17: Initial Version
+#    2026-10-19: Add --drain and --follow modes to read the stream continuously (multiple batches)
+#    2026-10-19: Add partition "all" to read all partitions in parallel and --checkpoint to resume reading
+#    2026-10-19: Add --group to read messages as a member of a consumer group (offsets committed by batches)
+#    2026-10-19: Add --sink to write messages (byte-exact) in JSONL or binary format, and support non UTF-8 messages
 # --------------------------------------------------------------------------------------------------------------
 
 # -- import
 import oci
+import os
 import sys
+import json
+import time
+import queue
+import struct
+import binascii
+import threading
 from base64 import b64encode, b64decode
 
 # ---------- Colors for output
@@ -28,13 +39,43 @@ COLOR_GREY="\033[90m"
 # ---------- variables
 configfile  = "~/.oci/config"    # OCI config file to be used
 nb_messages = 300                # Max nb of message to be read
+batch_limit = 10000              # Max nb of messages per read in drain/follow modes (10000 is the API maximum)
+max_batches_in_memory = 4        # Max nb of batches read in advance and not yet displayed (drain/follow modes)
+follow_wait = 1                  # Nb of seconds to wait before reading again when the end of the stream is reached (follow mode)
+commit_interval = 10             # Min nb of seconds between 2 commits of offsets (consumer group mode)
+
+# ---------- binary sink format: for each message, a header followed by key bytes and value bytes
+# ---------- header = partition (uint32), offset (uint64), timestamp in ms (int64), key length (int32, -1 if no key), value length (uint32)
+# ---------- all integers are big endian
+BINARY_HEADER = struct.Struct(">IQqiI")
 
 # ---------- functions
 def usage():
-    print ("Usage: {} OCI_PROFILE stream-id partition offset".format(sys.argv[0]))
+    print ("Usage: {} [--drain | --follow] [--limit nb_messages] [--sink jsonl|binary [--output file]]".format(sys.argv[0]))
+    print ("       [--checkpoint file] OCI_PROFILE stream-id partition offset")
+    print ("    or {} [--drain | --follow] [--limit nb_messages] [--sink jsonl|binary [--output file]]".format(sys.argv[0]))
+    print ("       --group group_name [--instance instance_name] [--commit_interval seconds] OCI_PROFILE stream-id")
     print ("")
     print ("Notes: ")
     print ("- Use offset \"all\" to list all messages in the stream partition")
+    print ("- Use partition \"all\" to read all the partitions of the stream in parallel")
+    print ("- If --checkpoint is provided, the next offset to read in each partition is saved in this file after")
+    print ("  each batch, and reading resumes from the saved offsets (instead of offset parameter) when re-running")
+    print ("- By default, only 1 batch of up to {} messages is read".format(nb_messages))
+    print ("- If --drain is provided, messages are read until the end of the stream partition is reached")
+    print ("- If --follow is provided, messages are read continuously, waiting for new messages (stop with CTRL-C)")
+    print ("- In drain and follow modes, messages are read by batches of up to {} messages (change it with --limit)".format(batch_limit))
+    print ("  and read rates (messages/sec and bytes/sec) are displayed at the end")
+    print ("- If --group is provided, messages are read as a member of the consumer group: partitions are shared between")
+    print ("  all the instances (processes) of the group and offsets are saved by the Streaming service. Offsets of displayed")
+    print ("  messages are committed at most every {} seconds (change it with --commit_interval) and when exiting".format(commit_interval))
+    print ("- If --sink is provided, messages are written without formatting to stdout or to the file given by --output")
+    print ("  (file is appended), keeping the exact bytes of keys and values (binary messages supported):")
+    print ("    --sink jsonl : 1 JSON line per message (partition, offset, timestamp, key and value encoded in base64)")
+    print ("    --sink binary: 1 record per message (header + key bytes + value bytes)")
+    print ("      header = partition (uint32), offset (uint64), timestamp in ms (int64), key length (int32, -1 for no key),")
+    print ("               value length (uint32), all big endian")
+    print ("  Other information is displayed on stderr")
     print ("- OCI_PROFILE must exist in {} file (see example below)".format(configfile))
     print ("")
     print ("[EMEAOSCf]")
@@ -45,16 +86,229 @@ def usage():
     print ("region      = eu-frankfurt-1")
     exit (1)
 
+# ---- load offsets saved in checkpoint file (next offset to read for each partition)
+def load_checkpoint():
+    if (checkpoint_file == None) or not(os.path.exists(checkpoint_file)):
+        return {}
+    try:
+        with open(checkpoint_file, "r") as f:
+            checkpoint = json.load(f)
+    except:
+        print ("ERROR 03: cannot read checkpoint file {} !".format(checkpoint_file))
+        exit (3)
+    if checkpoint["stream_id"] != stream_id:
+        print ("ERROR 04: checkpoint file {} was created for another stream !".format(checkpoint_file))
+        exit (4)
+    return checkpoint["offsets"]
+
+# ---- save offsets in checkpoint file (written in a temporary file first so that it is never left incomplete)
+def save_checkpoint(offsets):
+    tmp_file = checkpoint_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump({ "stream_id": stream_id, "offsets": offsets }, f)
+    os.replace(tmp_file, checkpoint_file)
+
+# ---- create a cursor for a partition
+def create_cursor(partition, offset):
+    print(COLOR_RED+"==== Creating a cursor for partition "+COLOR_CYAN+partition+COLOR_RED+" ",end="", file=log)
+    if offset == "all":
+        print ("of type = "+COLOR_CYAN+"TRIM_HORIZON"+COLOR_NORMAL, file=log)
+        cursor_details = oci.streaming.models.CreateCursorDetails(
+            partition=partition,
+            type=oci.streaming.models.CreateCursorDetails.TYPE_TRIM_HORIZON)
+    else:
+        print ("of type = "+COLOR_CYAN+"AT_OFFSET"+COLOR_RED+" (offset "+COLOR_CYAN+str(offset)+COLOR_RED+")"+COLOR_NORMAL, file=log)
+        cursor_details = oci.streaming.models.CreateCursorDetails(
+            partition=partition,
+            type=oci.streaming.models.CreateCursorDetails.TYPE_AT_OFFSET,
+            offset=int(offset))
+    response = StreamClient.create_cursor(stream_id, cursor_details)
+    return response.data.value
+
+# ---- create a group cursor for this instance of the consumer group
+# ---- new groups start at the oldest message, existing groups resume at their committed offsets
+def create_group_cursor():
+    print(COLOR_RED+"==== Creating a group cursor for group "+COLOR_CYAN+group_name+COLOR_RED+" and instance "+COLOR_CYAN+instance_name+COLOR_NORMAL, file=log)
+    cursor_details = oci.streaming.models.CreateGroupCursorDetails(
+        group_name=group_name,
+        instance_name=instance_name,
+        type=oci.streaming.models.CreateGroupCursorDetails.TYPE_TRIM_HORIZON,
+        commit_on_get=False)
+    response = StreamClient.create_group_cursor(stream_id, cursor_details)
+    return response.data.value
+
+# ---- commit the offsets of the messages read before this cursor (consumer group mode)
+def commit_offsets(cursor):
+    try:
+        StreamClient.consumer_commit(stream_id, cursor, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+    except Exception as error:
+        print (COLOR_RED+"ERROR: cannot commit offsets for group {}: {}".format(group_name, error)+COLOR_NORMAL, file=sys.stderr)
+
+# ---- display messages and return the number of bytes read (keys + values)
+def display_messages(messages):
+    nb_bytes = 0
+    for message in messages:
+        # print raw JSON message
+        # print (message)
+        # non UTF-8 bytes are displayed as \xNN
+        if message.key:
+            decoded_key = b64decode(message.key.encode())
+            nb_bytes += len(decoded_key)
+            decoded_key = decoded_key.decode(errors="backslashreplace")
+        else:
+            decoded_key = "null"
+        decoded_value = b64decode(message.value.encode())
+        nb_bytes += len(decoded_value)
+        decoded_value = decoded_value.decode(errors="backslashreplace")
+
+        print (COLOR_GREEN+"PARTITION : "+COLOR_YELLOW,message.partition)
+        print (COLOR_GREEN+"OFFSET    : "+COLOR_YELLOW,message.offset)
+        print (COLOR_GREEN+"DATE      : "+COLOR_CYAN,message.timestamp)
+        print (COLOR_GREEN+"KEY       : "+COLOR_CYAN,decoded_key)
+        print (COLOR_GREEN+"MESSAGE   : "+COLOR_NORMAL,decoded_value)
+        print (COLOR_YELLOW+"----------"+COLOR_NORMAL)
+    return nb_bytes
+
+# ---- size of decoded data from its base64 encoding
+def decoded_length(b64_string):
+    return len(b64_string) // 4 * 3 - (len(b64_string) - len(b64_string.rstrip("=")))
+
+# ---- write messages in JSONL format and return the number of bytes read (keys + values)
+# ---- keys and values are kept base64 encoded as received, so they are not decoded at all
+def write_messages_jsonl(messages):
+    nb_bytes = 0
+    lines = []
+    for message in messages:
+        lines.append(json.dumps({ "partition": message.partition, "offset": message.offset, "timestamp": str(message.timestamp),
+                                  "key": message.key, "value": message.value }))
+        if message.key:
+            nb_bytes += decoded_length(message.key)
+        nb_bytes += decoded_length(message.value)
+    lines.append("")
+    output.write("\n".join(lines).encode())
+    output.flush()
+    return nb_bytes
+
+# ---- write messages in binary format and return the number of bytes read (keys + values)
+# ---- the whole batch is decoded in a single buffer allocated once and written with a single write
+def write_messages_binary(messages):
+    sizes = []
+    buffer_size = 0
+    for message in messages:
+        key_length = decoded_length(message.key) if message.key else -1
+        value_length = decoded_length(message.value)
+        sizes.append((key_length, value_length))
+        buffer_size += BINARY_HEADER.size + max(key_length, 0) + value_length
+
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    position = 0
+    nb_bytes = 0
+    for message, (key_length, value_length) in zip(messages, sizes):
+        timestamp = int(message.timestamp.timestamp() * 1000) if message.timestamp else 0
+        BINARY_HEADER.pack_into(buffer, position, int(message.partition), message.offset, timestamp, key_length, value_length)
+        position += BINARY_HEADER.size
+        if key_length > 0:
+            view[position:position+key_length] = binascii.a2b_base64(message.key)
+            position += key_length
+        view[position:position+value_length] = binascii.a2b_base64(message.value)
+        position += value_length
+        nb_bytes += max(key_length, 0) + value_length
+    output.write(view)
+    output.flush()
+    view.release()
+    return nb_bytes
+
+# ---- read batches of messages from a partition (in a separate thread) and put them in a bounded queue shared by all partitions
+# ---- each batch is put in the queue with the cursor to use to read the next messages
+# ---- None is put in the queue when the end of the stream partition is reached (drain mode) or if an error occurs
+def read_batches(partition, cursor, batches):
+    try:
+        while True:
+            if drain or follow:
+                response = StreamClient.get_messages(stream_id, cursor, limit=batch_limit, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+            else:
+                response = StreamClient.get_messages(stream_id, cursor, limit=nb_messages, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+            cursor = response.headers["opc-next-cursor"]
+            if len(response.data) > 0:
+                batches.put((response.data, cursor))
+            elif follow:
+                time.sleep(follow_wait)
+            if not(follow) and (len(response.data) == 0 or not(drain)):
+                break
+    except Exception as error:
+        print (COLOR_RED+"ERROR: cannot read messages from partition {} of the stream: {}".format(partition, error)+COLOR_NORMAL, file=sys.stderr)
+    batches.put(None)
+
 # ---------- main
 
 # -- parsing arguments
-if (len(sys.argv) != 5):
+drain  = False
+follow = False
+checkpoint_file = None
+sink_format   = None
+output_file   = None
+group_name    = None
+instance_name = "instance-{}-{}".format(os.uname().nodename, os.getpid())
+args   = sys.argv[1:]
+while len(args) > 0 and args[0].startswith("--"):
+    if   args[0] == "--drain":  drain  = True
+    elif args[0] == "--follow": follow = True
+    elif args[0] == "--limit" and len(args) > 1 and args[1].isdigit():
+        batch_limit = int(args[1])
+        args = args[1:]
+    elif args[0] == "--checkpoint" and len(args) > 1:
+        checkpoint_file = args[1]
+        args = args[1:]
+    elif args[0] == "--sink" and len(args) > 1 and args[1] in ("jsonl", "binary"):
+        sink_format = args[1]
+        args = args[1:]
+    elif args[0] == "--output" and len(args) > 1:
+        output_file = args[1]
+        args = args[1:]
+    elif args[0] == "--group" and len(args) > 1:
+        group_name = args[1]
+        args = args[1:]
+    elif args[0] == "--instance" and len(args) > 1:
+        instance_name = args[1]
+        args = args[1:]
+    elif args[0] == "--commit_interval" and len(args) > 1 and args[1].isdigit():
+        commit_interval = int(args[1])
+        args = args[1:]
+    else: usage()
+    args = args[1:]
+
+if (drain and follow) or (batch_limit < 1) or (batch_limit > 10000) or (output_file != None and sink_format == None):
+    usage()
+if group_name == None and len(args) == 4:
+    partition = args[2]
+    offset    = args[3]
+elif group_name != None and len(args) == 2 and checkpoint_file == None:
+    partition = "group"
+else:
     usage()
 
-profile   = sys.argv[1] 
-stream_id = sys.argv[2]
-partition = sys.argv[3]
-offset    = sys.argv[4]
+profile   = args[0]
+stream_id = args[1]
+
+# -- Output of messages: formatted display (default) or sink (stdout or file). With a sink, other information goes to stderr
+if sink_format == None:
+    output_messages = display_messages
+    log = sys.stdout
+else:
+    if sink_format == "jsonl":
+        output_messages = write_messages_jsonl
+    else:
+        output_messages = write_messages_binary
+    log = sys.stderr
+    if output_file == None:
+        output = sys.stdout.buffer
+    else:
+        try:
+            output = open(output_file, "ab")
+        except:
+            print ("ERROR 05: cannot open output file {} !".format(output_file))
+            exit (5)
 
 # -- get OCI Config
 try:
@@ -64,44 +318,75 @@ except:
     exit (2)
 
 # -- Stream client
-endpoint = "https://cell-1.streaming."+config["region"]+".oci.oraclecloud.com"
+# -- if all partitions are read, get the number of partitions and the messages endpoint from the stream details
+if partition == "all":
+    StreamAdminClient = oci.streaming.StreamAdminClient(config)
+    stream = StreamAdminClient.get_stream(stream_id).data
+    partitions = [ str(i) for i in range(stream.partitions) ]
+    endpoint = stream.messages_endpoint
+else:
+    partitions = [ partition ]
+    endpoint = "https://cell-1.streaming."+config["region"]+".oci.oraclecloud.com"
 StreamClient = oci.streaming.StreamClient(config, endpoint)
 
-# -- Create a cursor
-print(COLOR_RED+"==== Creating a cursor ",end="")
-if offset == "all":
-    print ("of type = "+COLOR_CYAN+"TRIM_HORIZON"+COLOR_NORMAL)
-    cursor_details = oci.streaming.models.CreateCursorDetails(
-        partition=partition,
-        type=oci.streaming.models.CreateCursorDetails.TYPE_TRIM_HORIZON)
+# -- Create a cursor for each partition (at checkpoint offset if it exists)
+# -- or a single group cursor for the partitions assigned to this instance of the consumer group
+offsets = load_checkpoint()
+cursors = {}
+if group_name != None:
+    cursors["group"] = create_group_cursor()
 else:
-    print ("of type = "+COLOR_CYAN+"AT_OFFSET"+COLOR_NORMAL)
-    cursor_details = oci.streaming.models.CreateCursorDetails(
-        partition=partition,
-        type=oci.streaming.models.CreateCursorDetails.TYPE_AT_OFFSET,
-        offset=int(offset))
-response = StreamClient.create_cursor(stream_id, cursor_details)
-cursor = response.data.value
-
-# -- Read messages from the stream
-response = StreamClient.get_messages(stream_id, cursor, limit=nb_messages)
-if len(response.data) > 0:
-    print(COLOR_RED+"==== Reading "+COLOR_CYAN+"{}".format(len(response.data))+COLOR_RED+" messages"+COLOR_NORMAL)
-    for message in response.data:
-        # print raw JSON message
-        # print (message)
-        if message.key:
-            decoded_key = b64decode(message.key.encode()).decode()
-        else:
-            decoded_key = "null"
-        decoded_value = b64decode(message.value.encode()).decode()
+    for p in partitions:
+        cursors[p] = create_cursor(p, offsets.get(p, offset))
 
-        print (COLOR_GREEN+"PARTITION : "+COLOR_YELLOW,message.partition)
-        print (COLOR_GREEN+"OFFSET    : "+COLOR_YELLOW,message.offset)
-        print (COLOR_GREEN+"DATE      : "+COLOR_CYAN,message.timestamp)
-        print (COLOR_GREEN+"KEY       : "+COLOR_CYAN,decoded_key)
-        print (COLOR_GREEN+"MESSAGE   : "+COLOR_NORMAL,decoded_value)
-        print (COLOR_YELLOW+"----------"+COLOR_NORMAL)
+# -- Read messages from the stream partitions in parallel (1 thread per partition)
+# -- next batches are read while the current batch is displayed (max_batches_in_memory batches in advance)
+# -- by default, a single batch is read in each partition, in drain mode until end of stream and in follow mode until CTRL-C
+batches = queue.Queue(maxsize=max_batches_in_memory * len(partitions))
+for p in partitions:
+    threading.Thread(target=read_batches, args=(p, cursors[p], batches), daemon=True).start()
+
+nb_read    = 0
+bytes_read = 0
+nb_partitions_active = len(partitions)
+start_time  = time.time()
+commit_time = start_time
+commit_cursor = None        # cursor after the last displayed batch, not yet committed (consumer group mode)
+try:
+    while nb_partitions_active > 0:
+        item = batches.get()
+        if item == None:
+            nb_partitions_active -= 1
+            continue
+        batch, next_cursor = item
+        if sink_format == None:
+            batch_partitions = ",".join(sorted(set([ message.partition for message in batch ])))
+            print(COLOR_RED+"==== Reading "+COLOR_CYAN+"{}".format(len(batch))+COLOR_RED+" messages from partition "+COLOR_CYAN+batch_partitions+COLOR_NORMAL)
+        bytes_read += output_messages(batch)
+        nb_read    += len(batch)
+        if checkpoint_file != None:
+            offsets[batch[0].partition] = batch[-1].offset + 1
+            save_checkpoint(offsets)
+        if group_name != None:
+            commit_cursor = next_cursor
+            if time.time() - commit_time >= commit_interval:
+                commit_offsets(commit_cursor)
+                commit_cursor = None
+                commit_time = time.time()
+except KeyboardInterrupt:
+    pass
+
+# -- commit offsets of the last displayed messages
+if commit_cursor != None:
+    commit_offsets(commit_cursor)
+
+if not(drain) and not(follow):
+    exit (0)
+
+# -- display read rates
+elapsed = max(time.time() - start_time, 0.001)
+print (COLOR_RED+"==== {} messages ({} bytes) read in {:.1f} seconds: ".format(nb_read, bytes_read, elapsed),end="", file=sys.stderr)
+print ("{:.1f} messages/sec, {:.1f} bytes/sec".format(nb_read/elapsed, bytes_read/elapsed)+COLOR_NORMAL, file=sys.stderr)
 
 # -- happy end
 exit (0)